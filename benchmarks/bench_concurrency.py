@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Measures how conversational throughput scales with concurrent sessions.
+
+Every session runs a few direct-answer turns through the compiled graph with
+`graph.ainvoke`, against a fake LLM that sleeps for a fixed latency per call.
+Because the nodes are async, sessions overlap while they wait on the "network"
+and throughput should grow almost linearly with the number of sessions.
+
+Each session asks its own questions, so identical concurrent LLM calls are
+not coalesced, and the LLM scheduler's concurrency limit is lifted for the
+run: the benchmark measures the graph, not the provider protections.
+
+Usage:
+    python benchmarks/bench_concurrency.py --latency 0.2 --sessions 1 5 10 25 50
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from common import FakeChatModel, build_graph, quiet, turn_state
+from core.llm_scheduler import llm_scheduler
+
+
+async def run_session(graph, session: int, turns: int):
+    history = []
+    for turn in range(turns):
+        state = turn_state("direct", history)
+        state["user_message"] = f"What is the notice period? (session {session}, turn {turn})"
+        final_state = await graph.ainvoke(state)
+        history = final_state["conversation_history"]
+
+
+async def measure(graph, sessions: int, turns: int) -> dict:
+    start = time.perf_counter()
+    await asyncio.gather(*(run_session(graph, session, turns) for session in range(sessions)))
+    elapsed = time.perf_counter() - start
+    total_turns = sessions * turns
+    return {
+        "sessions": sessions,
+        "turns": total_turns,
+        "seconds": round(elapsed, 4),
+        "turns_per_second": round(total_turns / elapsed, 2),
+    }
+
+
+async def run(latency: float = 0.2, turns: int = 3, sessions=(1, 5, 10, 25, 50)) -> dict:
+    graph = build_graph(FakeChatModel(latency=latency))
+    # High enough that the scheduler never queues a call
+    llm_scheduler.configure(max_concurrency=max(sessions) * 3)
+    try:
+        results = [await measure(graph, n, turns) for n in sessions]
+    finally:
+        llm_scheduler.configure()
+    return {"latency": latency, "results": results}
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--turns", type=int, default=3)
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 5, 10, 25, 50])
+    parser.add_argument("--json", action="store_true", help="Print JSON only")
+    args = parser.parse_args()
+
+    with quiet():
+        report = await run(args.latency, args.turns, args.sessions)
+    results = report["results"]
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"Fake LLM latency: {args.latency}s per call, {args.turns} turns per session")
+    print(f"{'sessions':>10} {'turns':>8} {'seconds':>10} {'turns/s':>10}")
+    for row in results:
+        print(
+            f"{row['sessions']:>10} {row['turns']:>8} "
+            f"{row['seconds']:>10} {row['turns_per_second']:>10}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Measures graph invoke latency for each conversation path.
+
+Each path (direct answer, escalation, lawyer approval, lawyer corrections) is
+run repeatedly through the compiled graph against a fake LLM. Besides the
+latency percentiles, the report gives the LLM calls each path makes and the
+framework overhead: the time not spent waiting on the (fake) model.
+`--mode` selects the graph mode (see `graph.mode` in config.yaml), to compare
+sequential routing with the combined route-and-answer call and speculative
+answering. Speculative calls overlap, so their overhead comes out negative by
+the time saved.
+
+Usage:
+    python benchmarks/bench_graph.py --latency 0.05 --iterations 50
+    python benchmarks/bench_graph.py --mode combined
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from common import FakeChatModel, PATHS, build_graph, quiet, summarize, turn_state
+from core.graph_builder import GRAPH_MODES
+
+
+async def run(
+    latency: float = 0.05, iterations: int = 50, warmup: int = 3, mode: str = "sequential"
+) -> dict:
+    results = {}
+    for path in PATHS:
+        llm = FakeChatModel(latency=latency)
+        graph = build_graph(llm, mode=mode)
+        for _ in range(warmup):
+            await graph.ainvoke(turn_state(path))
+
+        llm.call_count = 0
+        samples = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            await graph.ainvoke(turn_state(path))
+            samples.append(time.perf_counter() - start)
+
+        stats = summarize(samples)
+        calls = llm.call_count / iterations
+        stats["llm_calls"] = calls
+        stats["overhead_ms"] = round(stats["mean_ms"] - calls * latency * 1000, 3)
+        results[path] = stats
+    return {"latency": latency, "iterations": iterations, "mode": mode, "paths": results}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--mode", choices=GRAPH_MODES, default="sequential")
+    parser.add_argument("--json", action="store_true", help="Print JSON only")
+    args = parser.parse_args()
+
+    with quiet():
+        report = asyncio.run(run(args.latency, args.iterations, mode=args.mode))
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(
+        f"Fake LLM latency: {args.latency}s per call, {args.iterations} iterations, "
+        f"{args.mode} graph"
+    )
+    print(f"{'path':>12} {'calls':>6} {'mean ms':>9} {'p95 ms':>9} {'overhead ms':>12}")
+    for path, row in report["paths"].items():
+        print(
+            f"{path:>12} {row['llm_calls']:>6} {row['mean_ms']:>9} "
+            f"{row['p95_ms']:>9} {row['overhead_ms']:>12}"
+        )
+
+
+if __name__ == "__main__":
+    main()
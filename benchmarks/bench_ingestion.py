@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Measures document ingestion throughput on a synthetic knowledge base.
+
+A temporary knowledge base of generated PDFs and DOCX files is loaded twice
+through `KnowledgeBase`: once cold (every file extracted) and once warm
+(every file served from the document cache), followed by building the
+clause index used for retrieval.
+
+Usage:
+    python benchmarks/bench_ingestion.py --pdfs 4 --pages 50 --docx 4
+"""
+
+import argparse
+import asyncio
+import json
+import resource
+import tempfile
+import time
+from pathlib import Path
+
+from common import quiet
+from document_sources.knowledge_base import KnowledgeBase
+from document_sources.local_file_source import LocalFileSource
+from synthetic_docs import write_docx, write_pdf
+
+
+async def _load(kb_dir: Path, cache_dir: Path, workers) -> tuple:
+    knowledge_base = KnowledgeBase(
+        kb_dir, LocalFileSource(cache_dir=str(cache_dir), max_workers=workers)
+    )
+    start = time.perf_counter()
+    # The loader logs every document; keep the report readable
+    with quiet():
+        await knowledge_base.load()
+    return knowledge_base, time.perf_counter() - start
+
+
+async def run(
+    pdfs: int = 4, pages: int = 50, docx_files: int = 4, paragraphs: int = 300, workers=None
+) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        kb_dir, cache_dir = Path(tmp) / "kb", Path(tmp) / "cache"
+        kb_dir.mkdir()
+        for index in range(pdfs):
+            write_pdf(kb_dir / f"contract-{index}.pdf", pages, seed=index)
+        for index in range(docx_files):
+            write_docx(kb_dir / f"agreement-{index}.docx", paragraphs, seed=index)
+        corpus_bytes = sum(path.stat().st_size for path in kb_dir.iterdir())
+
+        knowledge_base, cold = await _load(kb_dir, cache_dir, workers)
+        _, warm = await _load(kb_dir, cache_dir, workers)
+
+        start = time.perf_counter()
+        clause_index = knowledge_base.build_clause_index()
+        index_seconds = time.perf_counter() - start
+
+    total_pages = pdfs * pages
+    return {
+        "corpus": {
+            "pdfs": pdfs,
+            "pages_per_pdf": pages,
+            "docx": docx_files,
+            "paragraphs_per_docx": paragraphs,
+            "bytes": corpus_bytes,
+        },
+        "workers": workers,
+        "documents_loaded": len(knowledge_base.documents),
+        "cold_seconds": round(cold, 4),
+        "warm_seconds": round(warm, 4),
+        "pdf_pages_per_second_cold": round(total_pages / cold, 2) if total_pages else None,
+        "clause_index_seconds": round(index_seconds, 4),
+        "clauses_indexed": len(clause_index.clauses),
+        # ru_maxrss is in kilobytes on Linux
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pdfs", type=int, default=4)
+    parser.add_argument("--pages", type=int, default=50)
+    parser.add_argument("--docx", type=int, default=4)
+    parser.add_argument("--paragraphs", type=int, default=300)
+    parser.add_argument(
+        "--workers", type=int, default=None, help="Extraction processes (0 = threads)"
+    )
+    parser.add_argument("--json", action="store_true", help="Print JSON only")
+    args = parser.parse_args()
+
+    report = asyncio.run(
+        run(args.pdfs, args.pages, args.docx, args.paragraphs, args.workers)
+    )
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"Corpus: {json.dumps(report['corpus'])}")
+    print(f"Cold load:    {report['cold_seconds']}s ({report['pdf_pages_per_second_cold']} PDF pages/s)")
+    print(f"Warm load:    {report['warm_seconds']}s (document cache)")
+    print(f"Clause index: {report['clause_index_seconds']}s ({report['clauses_indexed']} clauses)")
+    print(f"Peak RSS:     {report['peak_rss_mb']} MB")
+
+
+if __name__ == "__main__":
+    main()
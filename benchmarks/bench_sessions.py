@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Measures how session memory grows with conversation length.
+
+One session is driven through many direct-answer turns, with and without the
+history manager compacting older turns into a summary. After every
+`--sample-every` turns the report records the estimated session size (the
+figure the in-memory session store budgets with), the history length, and
+the Python heap in use as measured by tracemalloc.
+
+Usage:
+    python benchmarks/bench_sessions.py --turns 60 --sample-every 10
+"""
+
+import argparse
+import asyncio
+import json
+import tracemalloc
+
+from common import FakeChatModel, HistoryManager, build_graph, quiet, turn_state
+from storage.memory_session_store import estimate_session_size
+
+
+async def grow_session(turns: int, sample_every: int, compact: bool) -> list:
+    llm = FakeChatModel()
+    history_manager = HistoryManager() if compact else None
+    graph = build_graph(llm, history_manager)
+    session = {"conversation_history": [], "history_summary": None}
+
+    samples = []
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    for turn in range(1, turns + 1):
+        state = turn_state("direct", session["conversation_history"])
+        state["history_summary"] = session["history_summary"]
+        final_state = await graph.ainvoke(state)
+        session["conversation_history"] = final_state["conversation_history"]
+        if history_manager:
+            session["conversation_history"], session["history_summary"] = (
+                await history_manager.compact(
+                    session["conversation_history"], session["history_summary"], llm
+                )
+            )
+        if turn % sample_every == 0 or turn == turns:
+            samples.append(
+                {
+                    "turn": turn,
+                    "messages": len(session["conversation_history"]),
+                    "session_bytes": estimate_session_size(session),
+                    "heap_bytes": tracemalloc.get_traced_memory()[0] - baseline,
+                }
+            )
+    tracemalloc.stop()
+    return samples
+
+
+async def run(turns: int = 60, sample_every: int = 10) -> dict:
+    return {
+        "turns": turns,
+        "uncompacted": await grow_session(turns, sample_every, compact=False),
+        "compacted": await grow_session(turns, sample_every, compact=True),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--turns", type=int, default=60)
+    parser.add_argument("--sample-every", type=int, default=10)
+    parser.add_argument("--json", action="store_true", help="Print JSON only")
+    args = parser.parse_args()
+
+    with quiet():
+        report = asyncio.run(run(args.turns, args.sample_every))
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    for mode in ("uncompacted", "compacted"):
+        print(f"{mode}:")
+        print(f"{'turn':>8} {'messages':>9} {'session KB':>11} {'heap KB':>9}")
+        for row in report[mode]:
+            print(
+                f"{row['turn']:>8} {row['messages']:>9} "
+                f"{row['session_bytes'] / 1024:>11.1f} {row['heap_bytes'] / 1024:>9.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Shared helpers for the benchmark scripts: import paths, the graph under test,
+turn states for each conversation path, and summary statistics.
+"""
+
+import contextlib
+import io
+import statistics
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from core.graph_builder import create_conversational_graph  # noqa: E402
+from core.history_manager import HistoryManager  # noqa: E402
+from fake_llm import DEFAULT_BRIEFING, FakeChatModel  # noqa: E402
+
+SAMPLE_CONTEXT = (
+    "--- Document: Sample.pdf ---\n"
+    "5.2 Termination. Either party may terminate this Agreement with thirty (30) "
+    "days' written notice.\n"
+    "9.1 Indemnity. Each party shall indemnify the other against third-party claims."
+)
+
+ESCALATION_RULES = """# --- Keywords ---
+- indemnity
+- liability
+"""
+
+# Turn inputs for each path through the graph. "indemnity" is escalated by
+# the keyword pre-router; the fake model routes on markers in the prompt:
+# "escalate" for the LLM router and "approve" in the lawyer's reply for the
+# feedback router.
+PATHS: Dict[str, dict] = {
+    "direct": {
+        "user_message": "What is the notice period for termination?",
+        "lawyer_message": None,
+    },
+    "escalate": {
+        "user_message": "What are our indemnity obligations?",
+        "lawyer_message": None,
+    },
+    "escalate_llm": {
+        "user_message": "Should we escalate the missed delivery dispute?",
+        "lawyer_message": None,
+    },
+    "approve": {
+        "user_message": None,
+        "lawyer_message": "Approved, send it.",
+        "escalated_question": "Can we terminate early?",
+        "prepared_briefing": DEFAULT_BRIEFING,
+    },
+    "corrections": {
+        "user_message": None,
+        "lawyer_message": "Change it to 60 days' notice for the hosting services.",
+        "escalated_question": "Can we terminate early?",
+        "prepared_briefing": DEFAULT_BRIEFING,
+    },
+}
+
+
+def build_graph(
+    llm: FakeChatModel, history_manager: HistoryManager = None, mode: str = "sequential"
+):
+    return create_conversational_graph(
+        llm, SAMPLE_CONTEXT, ESCALATION_RULES, history_manager=history_manager, mode=mode
+    )
+
+
+def turn_state(path: str, history: list = None) -> dict:
+    return {
+        "conversation_history": history or [],
+        "history_summary": None,
+        "escalated_question": None,
+        "prepared_briefing": None,
+        "websocket": None,
+        **PATHS[path],
+    }
+
+
+def summarize(samples: List[float]) -> dict:
+    """Mean and percentiles of a list of durations, in milliseconds."""
+    ordered = sorted(samples)
+
+    def percentile(p: float) -> float:
+        index = min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))
+        return round(ordered[index] * 1000, 3)
+
+    return {
+        "count": len(ordered),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 3),
+        "p50_ms": percentile(50),
+        "p95_ms": percentile(95),
+        "p99_ms": percentile(99),
+        "max_ms": round(ordered[-1] * 1000, 3),
+    }
+
+
+def quiet():
+    """Swallows the nodes' progress logging so only the report is printed."""
+    return contextlib.redirect_stdout(io.StringIO())
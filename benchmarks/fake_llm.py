@@ -0,0 +1,156 @@
+"""
+Deterministic stand-in for ChatGoogleGenerativeAI used by the benchmarks.
+
+The fake model never leaves the process. It sleeps for a configurable latency
+(with asyncio.sleep on the async path, so it behaves like a network-bound
+provider) and returns canned text or structured outputs.
+"""
+
+import asyncio
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.runnables import RunnableLambda
+
+
+DEFAULT_ANSWER = (
+    "You can terminate with 30 days' written notice (Section 5.2). "
+    "Would you like to know about early termination charges?"
+)
+
+DEFAULT_BRIEFING = (
+    "User asks: Can we terminate early?\n"
+    "Contract says: 30-day notice required (Section 5.2)\n"
+    "My proposed answer: Yes, early termination allowed with 30-day written notice.\n"
+    "Is this okay?"
+)
+
+
+def _last_message_text(messages: List[BaseMessage]) -> str:
+    return str(messages[-1].content) if messages else ""
+
+
+def _usage(messages: List[BaseMessage], text: str) -> Dict[str, int]:
+    """Token usage in the shape real providers report it (4 chars per token)."""
+    prompt_tokens = sum(len(str(message.content)) for message in messages) // 4
+    completion_tokens = len(text) // 4
+    return {
+        "input_tokens": prompt_tokens,
+        "output_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+    }
+
+
+def _default_structured_fields(schema: type, prompt_text: str) -> Dict[str, Any]:
+    """Pick structured output values from markers in the prompt."""
+    fields = schema.model_fields
+    lowered = prompt_text.lower()
+    values: Dict[str, Any] = {}
+
+    if "decision" in fields:
+        values["decision"] = (
+            "escalate_to_lawyer" if "escalate" in lowered else "answer_directly"
+        )
+    if "feedback_type" in fields:
+        lawyer_part = lowered.split("lawyer response:")[-1]
+        values["feedback_type"] = (
+            "approve_briefing" if "approve" in lawyer_part else "provide_corrections"
+        )
+    if "extracted_suggestions" in fields:
+        values["extracted_suggestions"] = ""
+    return values
+
+
+class FakeChatModel(BaseChatModel):
+    """Chat model with injectable latency and canned responses."""
+
+    latency: float = 0.0
+    answer: str = DEFAULT_ANSWER
+    briefing: str = DEFAULT_BRIEFING
+    enhancement: str = "NO_ENHANCEMENT_NEEDED"
+    call_count: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat"
+
+    def _respond(self, messages: List[BaseMessage]) -> str:
+        system_text = str(messages[0].content) if messages else ""
+        if "briefing a busy lawyer" in system_text:
+            return self.briefing
+        if "contextual enhancement" in system_text:
+            return self.enhancement
+        return self.answer
+
+    def _message(self, messages: List[BaseMessage]) -> AIMessage:
+        text = self._respond(messages)
+        return AIMessage(content=text, usage_metadata=_usage(messages, text))
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        self.call_count += 1
+        time.sleep(self.latency)
+        message = self._message(messages)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        self.call_count += 1
+        await asyncio.sleep(self.latency)
+        message = self._message(messages)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        """Streams the response word by word, spreading the latency across tokens."""
+        self.call_count += 1
+        response = self._respond(messages)
+        words = response.split(" ")
+        for index, word in enumerate(words):
+            await asyncio.sleep(self.latency / len(words))
+            text = word if index == 0 else " " + word
+            # Like real providers, usage is reported on the last chunk
+            usage = _usage(messages, response) if index == len(words) - 1 else None
+            chunk = ChatGenerationChunk(
+                message=AIMessageChunk(content=text, usage_metadata=usage)
+            )
+            if run_manager:
+                await run_manager.on_llm_new_token(text, chunk=chunk)
+            yield chunk
+
+    def with_structured_output(self, schema: type, **kwargs: Any):
+        def _build(prompt_value) -> Any:
+            self.call_count += 1
+            text = _last_message_text(prompt_value.to_messages())
+            values = _default_structured_fields(schema, text)
+            if "answer" in schema.model_fields and values["decision"] == "answer_directly":
+                values["answer"] = self.answer
+            return schema(**values)
+
+        def _call(prompt_value) -> Any:
+            time.sleep(self.latency)
+            return _build(prompt_value)
+
+        async def _acall(prompt_value) -> Any:
+            await asyncio.sleep(self.latency)
+            return _build(prompt_value)
+
+        return RunnableLambda(_call, afunc=_acall)
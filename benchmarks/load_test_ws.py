@@ -0,0 +1,385 @@
+#!/usr/bin/env python3
+"""
+Websocket load test: how many concurrent chat sessions one app process holds.
+
+By default the real FastAPI app is served in-process by uvicorn, with the
+knowledge base, retrieval, history and session settings from config.yaml,
+and Gemini replaced by the fake chat model. N clients then connect to `/ws`
+and replay a realistic mix of conversations: mostly direct questions, some
+questions that escalate to the lawyer, and lawyer replies that either
+approve the briefing or correct it.
+
+For each stage (number of concurrent connections) the report gives turn
+throughput, latency percentiles per frame type (and time to first streamed
+token), errors, and memory per session. The answer cache is off in-process
+(`--answer-cache` turns it on), since the replayed questions repeat. Use
+`--url` to drive an already running server instead; memory is then taken
+from its /sessions/stats.
+
+Usage:
+    python benchmarks/load_test_ws.py --connections 10 50 100 --turns 5
+    python benchmarks/load_test_ws.py --url ws://localhost:8000/ws --connections 20
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import os
+import random
+import socket
+import sys
+import time
+import urllib.request
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+from websockets.asyncio.client import connect
+
+from common import ROOT, FakeChatModel, quiet, summarize
+
+DIRECT_QUESTIONS = [
+    "What is the notice period for terminating the agreement?",
+    "When are invoices due under the contract?",
+    "How long does the initial term last?",
+    "Which law governs this agreement?",
+    "What availability does the provider commit to each month?",
+    "How long do the confidentiality obligations survive?",
+    "Can you summarise the payment terms?",
+    "What happens if we pay an invoice late?",
+]
+
+ESCALATING_QUESTIONS = [
+    "What is our liability if the service goes down for a week?",
+    "Are we covered by the indemnity if a customer sues us?",
+    "Could they take us to court over the missed delivery?",
+    "Is there a data breach notification obligation?",
+    "Does the exclusivity clause stop us working with other vendors?",
+]
+
+LAWYER_APPROVALS = [
+    "Approved, send it.",
+    "I approve, that answer is correct.",
+]
+
+LAWYER_CORRECTIONS = [
+    "Change it to say 60 days' notice applies to the hosting services.",
+    "Add that liability is capped at twelve months of fees.",
+    "Actually, mention that the client must notify us in writing first.",
+]
+
+
+class SessionStats:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.first_token: List[float] = []
+        self.errors = 0
+        self.turns = 0
+
+
+async def _send_and_wait(ws, frame: dict, stats: SessionStats) -> bool:
+    """
+    Sends one frame and waits for the final `user_response`. Returns whether
+    the turn was escalated, in which case the `lawyer_request` is consumed
+    too.
+    """
+    start = time.perf_counter()
+    first_token = None
+    escalated = False
+    await ws.send(json.dumps(frame))
+    while True:
+        message = json.loads(await ws.recv())
+        kind = message.get("type")
+        if kind == "user_response_delta" and first_token is None:
+            first_token = time.perf_counter() - start
+        elif kind == "status_update" and message.get("status") == "escalation":
+            escalated = True
+        elif kind == "error":
+            stats.errors += 1
+            return False
+        elif kind == "user_response":
+            break
+
+    stats.latencies[frame["type"]].append(time.perf_counter() - start)
+    if first_token is not None:
+        stats.first_token.append(first_token)
+    stats.turns += 1
+
+    if escalated:
+        while json.loads(await ws.recv()).get("type") != "lawyer_request":
+            pass
+    return escalated
+
+
+async def run_session(
+    url: str,
+    turns: int,
+    escalation_rate: float,
+    approval_rate: float,
+    think_time: float,
+    rng: random.Random,
+    stats: SessionStats,
+):
+    try:
+        async with connect(url, max_size=None, open_timeout=60) as ws:
+            json.loads(await ws.recv())  # session frame
+            for _ in range(turns):
+                if rng.random() < escalation_rate:
+                    question = rng.choice(ESCALATING_QUESTIONS)
+                else:
+                    question = rng.choice(DIRECT_QUESTIONS)
+                escalated = await _send_and_wait(
+                    ws, {"type": "user_message", "content": question}, stats
+                )
+                if escalated:
+                    await asyncio.sleep(rng.expovariate(1 / think_time) if think_time else 0)
+                    replies = (
+                        LAWYER_APPROVALS
+                        if rng.random() < approval_rate
+                        else LAWYER_CORRECTIONS
+                    )
+                    await _send_and_wait(
+                        ws, {"type": "lawyer_message", "content": rng.choice(replies)}, stats
+                    )
+                await asyncio.sleep(rng.expovariate(1 / think_time) if think_time else 0)
+    except Exception as e:
+        print(f"Session failed: {type(e).__name__}: {e}", file=sys.stderr)
+        stats.errors += 1
+
+
+def _rss_bytes() -> Optional[int]:
+    """Current resident set size of this process (Linux only)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return None
+
+
+def _http_json(url: str) -> dict:
+    with urllib.request.urlopen(url, timeout=10) as response:
+        return json.load(response)
+
+
+async def run_stage(url: str, connections: int, args, app=None) -> dict:
+    if app is not None:
+        # Every stage starts with an empty session store. The answer cache is
+        # off unless asked for: the questions repeat, so after a few turns
+        # nearly every turn would be a cache hit and measure the cache, not
+        # the graph.
+        from implementations.web.main import create_answer_cache, create_session_store
+        from config.config_manager import ConfigManager
+
+        config_manager = ConfigManager()
+        app.state.session_store = create_session_store(
+            config_manager.get_session_config()
+        )
+        app.state.answer_cache = (
+            create_answer_cache(config_manager.get_answer_cache_config())
+            if args.answer_cache
+            else None
+        )
+    gc.collect()
+    rss_before = _rss_bytes()
+
+    rng = random.Random(args.seed)
+    all_stats = [SessionStats() for _ in range(connections)]
+    start = time.perf_counter()
+    tasks = []
+    for stats in all_stats:
+        tasks.append(
+            asyncio.create_task(
+                run_session(
+                    url,
+                    args.turns,
+                    args.escalation_rate,
+                    args.approval_rate,
+                    args.think_time,
+                    random.Random(rng.random()),
+                    stats,
+                )
+            )
+        )
+        if args.ramp_up:
+            await asyncio.sleep(args.ramp_up / connections)
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - start
+
+    latencies = defaultdict(list)
+    first_token = []
+    for stats in all_stats:
+        for frame_type, samples in stats.latencies.items():
+            latencies[frame_type].extend(samples)
+        first_token.extend(stats.first_token)
+    turns = sum(stats.turns for stats in all_stats)
+
+    if app is not None:
+        gc.collect()
+        store_stats = await app.state.session_store.stats()
+        rss_after = _rss_bytes()
+    else:
+        base = url.replace("ws://", "http://").replace("wss://", "https://")
+        store_stats = _http_json(base.rsplit("/ws", 1)[0] + "/sessions/stats")
+        rss_after = None
+
+    memory = {"sessions_stored": store_stats.get("entries")}
+    if store_stats.get("entries") and "memory_bytes" in store_stats:
+        memory["store_bytes_per_session"] = round(
+            store_stats["memory_bytes"] / store_stats["entries"]
+        )
+    if rss_before and rss_after:
+        memory["rss_mb"] = round(rss_after / 2**20, 1)
+        memory["rss_bytes_per_session"] = round((rss_after - rss_before) / connections)
+
+    return {
+        "connections": connections,
+        "seconds": round(elapsed, 3),
+        "turns": turns,
+        "turns_per_second": round(turns / elapsed, 2),
+        "errors": sum(stats.errors for stats in all_stats),
+        "latency": {
+            frame_type: summarize(samples) for frame_type, samples in latencies.items()
+        },
+        "first_token": summarize(first_token) if first_token else None,
+        "memory": memory,
+    }
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def start_app(latency: float, streaming: bool):
+    """
+    Serves the web app in-process with the fake LLM, going through the same
+    setup as startup but without the Gemini client. Returns (app, server, url).
+    """
+    import uvicorn
+
+    # config.yaml paths are relative to the project root
+    os.chdir(ROOT)
+    sys.path.insert(0, str(ROOT))
+    from implementations.web import main as web
+    from config.config_manager import ConfigManager
+    from core.history_manager import HistoryManager
+    from document_sources.knowledge_base import KnowledgeBase
+    from document_sources.local_file_source import LocalFileSource
+
+    config_manager = ConfigManager()
+    doc_config = config_manager.get_document_config()
+    history_config = config_manager.get_history_config()
+
+    app = web.app
+    app.router.on_startup.clear()
+    app.router.on_shutdown.clear()
+
+    knowledge_base = KnowledgeBase(
+        doc_config.get("knowledge_base_path"),
+        LocalFileSource(cache_dir=doc_config.get("cache_dir")),
+    )
+    with quiet():
+        await knowledge_base.load()
+    app.state.knowledge_base = knowledge_base
+    app.state.retrieval_config = config_manager.get_retrieval_config()
+    app.state.graph_config = config_manager.get_graph_config()
+    app.state.history_manager = HistoryManager(
+        keep_last_turns=history_config.get("keep_last_turns", 6),
+        router_turns=history_config.get("router_turns", 2),
+        max_history_tokens=history_config.get("max_history_tokens", 2000),
+        summary_max_tokens=history_config.get("summary_max_tokens", 300),
+        compact_batch_turns=history_config.get("compact_batch_turns", 4),
+    )
+    app.state.escalation_rules = (ROOT / doc_config.get("escalation_rules_file")).read_text()
+    app.state.llm = FakeChatModel(latency=latency)
+    app.state.streaming = streaming
+    with quiet():
+        app.state.graph = web.build_graph(app.state)
+    app.state.graph_content_hash = knowledge_base.content_hash
+
+    port = _free_port()
+    server = uvicorn.Server(
+        uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", ws_max_size=2**24)
+    )
+    asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+    return app, server, f"ws://127.0.0.1:{port}/ws"
+
+
+async def run(args) -> dict:
+    app = server = None
+    url = args.url
+    if url is None:
+        app, server, url = await start_app(args.latency, not args.no_streaming)
+
+    stages = []
+    try:
+        for connections in args.connections:
+            with quiet():
+                stages.append(await run_stage(url, connections, args, app))
+    finally:
+        if server is not None:
+            server.should_exit = True
+            await asyncio.sleep(0.2)
+
+    return {
+        "target": args.url or "in-process",
+        "fake_llm_latency": None if args.url else args.latency,
+        "streaming": None if args.url else not args.no_streaming,
+        "answer_cache": None if args.url else args.answer_cache,
+        "turns_per_session": args.turns,
+        "escalation_rate": args.escalation_rate,
+        "approval_rate": args.approval_rate,
+        "think_time": args.think_time,
+        "stages": stages,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--connections", type=int, nargs="+", default=[10, 50, 100])
+    parser.add_argument("--turns", type=int, default=5, help="User turns per session")
+    parser.add_argument("--latency", type=float, default=0.3, help="Fake LLM latency (s)")
+    parser.add_argument("--escalation-rate", type=float, default=0.2)
+    parser.add_argument("--approval-rate", type=float, default=0.6)
+    parser.add_argument("--think-time", type=float, default=0.5, help="Mean pause between frames (s)")
+    parser.add_argument("--ramp-up", type=float, default=1.0, help="Seconds to open all connections")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-streaming", action="store_true")
+    parser.add_argument(
+        "--answer-cache", action="store_true", help="Keep the app's answer cache on"
+    )
+    parser.add_argument("--url", help="Target a running server instead (ws://host:port/ws)")
+    parser.add_argument("--json", action="store_true", help="Print JSON only")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(
+        f"Target: {report['target']}, {args.turns} user turns per session, "
+        f"{args.escalation_rate:.0%} escalated"
+    )
+    print(
+        f"{'conns':>6} {'turns/s':>8} {'user p50':>9} {'user p99':>9} "
+        f"{'lawyer p99':>11} {'errors':>7} {'KB/session':>11}"
+    )
+    for stage in report["stages"]:
+        user = stage["latency"].get("user_message", {})
+        lawyer = stage["latency"].get("lawyer_message", {})
+        memory = stage["memory"]
+        per_session = memory.get("rss_bytes_per_session", memory.get("store_bytes_per_session"))
+        print(
+            f"{stage['connections']:>6} {stage['turns_per_second']:>8} "
+            f"{user.get('p50_ms', '-'):>9} {user.get('p99_ms', '-'):>9} "
+            f"{lawyer.get('p99_ms', '-'):>11} {stage['errors']:>7} "
+            f"{(per_session or 0) / 1024:>11.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
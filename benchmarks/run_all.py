@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Runs every offline benchmark and writes one JSON report for regression
+tracking.
+
+Usage:
+    python benchmarks/run_all.py --output benchmark-results.json
+    python benchmarks/run_all.py --quick
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import subprocess
+import time
+from datetime import datetime, timezone
+
+import bench_concurrency
+import bench_graph
+import bench_ingestion
+import bench_sessions
+from common import ROOT, quiet
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+async def run(quick: bool, latency: float) -> dict:
+    scale = 5 if quick else 1
+    benchmarks = {
+        "graph": lambda: bench_graph.run(latency, iterations=50 // scale),
+        "graph_combined": lambda: bench_graph.run(
+            latency, iterations=50 // scale, mode="combined"
+        ),
+        "graph_speculative": lambda: bench_graph.run(
+            latency, iterations=50 // scale, mode="speculative"
+        ),
+        "concurrency": lambda: bench_concurrency.run(
+            latency, turns=3, sessions=[1, 10] if quick else [1, 5, 10, 25, 50]
+        ),
+        "ingestion": lambda: bench_ingestion.run(
+            pdfs=4 // (2 if quick else 1), pages=50 // scale, docx_files=2, paragraphs=300 // scale
+        ),
+        "sessions": lambda: bench_sessions.run(turns=60 // scale, sample_every=10 // scale),
+    }
+
+    results = {}
+    for name, benchmark in benchmarks.items():
+        start = time.perf_counter()
+        with quiet():
+            results[name] = await benchmark()
+        results[name]["elapsed_seconds"] = round(time.perf_counter() - start, 3)
+
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "fake_llm_latency": latency,
+        "benchmarks": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--quick", action="store_true", help="Smaller workloads")
+    parser.add_argument("--output", help="Write the report to this file")
+    args = parser.parse_args()
+
+    report = json.dumps(asyncio.run(run(args.quick, args.latency)), indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(report + "\n")
+        print(f"Wrote {args.output}")
+    else:
+        print(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Generates synthetic contracts for the ingestion benchmark: multi-page PDFs
+(written directly, so no PDF library is needed) and DOCX files (via
+python-docx, which the app already depends on).
+"""
+
+import random
+from pathlib import Path
+from typing import List
+
+CLAUSE_TOPICS = [
+    ("Term", "This Agreement commences on the Effective Date and continues for {n} months."),
+    ("Termination", "Either party may terminate this Agreement with {n} days' written notice."),
+    ("Fees", "Customer shall pay all undisputed invoices within {n} days of receipt."),
+    ("Liability", "Liability is capped at {n} times the fees paid in the prior twelve months."),
+    ("Confidentiality", "Confidential Information shall be protected for {n} years after termination."),
+    ("Governing Law", "This Agreement is governed by the laws of the State of New York."),
+    ("Service Levels", "The Provider shall maintain availability of 99.{n} percent each month."),
+]
+
+
+def synthetic_clauses(count: int, seed: int = 0) -> List[str]:
+    rng = random.Random(seed)
+    clauses = []
+    for number in range(1, count + 1):
+        title, template = rng.choice(CLAUSE_TOPICS)
+        body = " ".join(template.format(n=rng.randint(2, 90)) for _ in range(3))
+        clauses.append(f"{number}. {title}. {body}")
+    return clauses
+
+
+def _pdf_escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def _wrap(text: str, width: int = 90) -> List[str]:
+    lines, line = [], ""
+    for word in text.split():
+        if line and len(line) + len(word) + 1 > width:
+            lines.append(line)
+            line = word
+        else:
+            line = f"{line} {word}".strip()
+    if line:
+        lines.append(line)
+    return lines
+
+
+def write_pdf(path: Path, pages: int, clauses_per_page: int = 6, seed: int = 0):
+    """Writes a text PDF with `pages` pages of numbered contract clauses."""
+    clauses = synthetic_clauses(pages * clauses_per_page, seed)
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # page tree, filled in once the page ids are known
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    page_ids = []
+    for page in range(pages):
+        lines = []
+        for clause in clauses[page * clauses_per_page : (page + 1) * clauses_per_page]:
+            lines.extend(_wrap(clause))
+            lines.append("")
+        text_ops = "".join(f"({_pdf_escape(line)}) Tj T* " for line in lines)
+        stream = f"BT /F1 9 Tf 11 TL 50 780 Td {text_ops}ET".encode("latin-1")
+        objects.append(
+            b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream"
+        )
+        content_id = len(objects)
+        objects.append(
+            (
+                "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>"
+            ).encode()
+        )
+        page_ids.append(len(objects))
+    kids = " ".join(f"{page_id} 0 R" for page_id in page_ids)
+    objects[1] = f"<< /Type /Pages /Kids [{kids}] /Count {pages} >>".encode()
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref_offset = len(output)
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    output += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    output += (
+        b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n"
+        % (len(objects) + 1, xref_offset)
+    )
+    path.write_bytes(bytes(output))
+
+
+def write_docx(path: Path, paragraphs: int, seed: int = 0):
+    """Writes a DOCX contract with `paragraphs` clauses."""
+    from docx import Document
+
+    document = Document()
+    document.add_heading("Master Services Agreement", level=1)
+    for clause in synthetic_clauses(paragraphs, seed):
+        document.add_paragraph(clause)
+    document.save(str(path))
@@ -1,29 +1,53 @@
 import asyncio
 import os
+import time
 import uuid
+from functools import lru_cache, partial
 from pathlib import Path
 import sys
+from typing import Optional
 
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Request
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Request, Response
+from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from langchain_core.messages import AIMessage
-from langchain_google_genai import ChatGoogleGenerativeAI
+from langchain_core.messages import AIMessage, HumanMessage
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 
 # Adjust sys.path to include the src directory
 src_path = Path(__file__).resolve().parents[2] / "src"
 sys.path.insert(0, str(src_path))
 
 from config.config_manager import ConfigManager
+from core.answer_cache import AnswerCache
+from core.enhancement_gate import EnhancementGate
+from core.escalation_rules import EscalationRules
+from core.risk_engine import RiskEngine
 from core.graph_builder import create_conversational_graph
+from core.graph_nodes import (
+    SHARED_TOKEN,
+    SPECULATION_RESOLVED,
+    SPECULATIVE_NODE,
+    STREAMED_NODES,
+    STRUCTURED_OUTPUT_TAG,
+    enhance_response,
+)
+from core.history_manager import HistoryManager
+from core.llm_scheduler import llm_scheduler
+from core.metrics import (
+    TURN_DURATION,
+    record_answer_cache_stats,
+    record_session_store_stats,
+)
+from document_sources.knowledge_base import KnowledgeBase
 from document_sources.local_file_source import LocalFileSource
+from interfaces.session_store import SessionStore
+from storage.memory_session_store import InMemorySessionStore
+from storage.sqlite_session_store import SQLiteSessionStore
 
 # --- Application Setup ---
 app = FastAPI()
 
-# In-memory session management
-sessions = {}
-
 
 @app.on_event("startup")
 async def startup_event():
@@ -73,25 +97,38 @@ async def startup_event():
 
     # === INITIALIZE CONFIGURATION ===
     config_manager = ConfigManager()
-    llm_config = config_manager.get_llm_config()
     doc_config = config_manager.get_document_config()
+    web_config = config_manager.get_web_config()
+    app.state.streaming = web_config.get("streaming", True)
+    app.state.progressive_delivery = web_config.get("progressive_delivery", False)
 
-    # === LOAD DOCUMENTS ===
-    doc_source = LocalFileSource()
-    knowledge_base_path = Path(doc_config.get("knowledge_base_path"))
-
-    full_doc_context = ""
-    if knowledge_base_path.exists():
-        for file_path in knowledge_base_path.glob("*"):
-            if doc_source.validate_source(str(file_path)):
-                print(f"Loading document: {file_path.name}")
-                # Correctly await the async function
-                doc_data = await doc_source.load_document(str(file_path))
-                full_doc_context += (
-                    f"\n\n--- Document: {file_path.name} ---\n\n{doc_data['content']}"
-                )
-    else:
-        print(f"⚠️ Knowledge base path does not exist: {knowledge_base_path}")
+    # === SESSIONS ===
+    app.state.session_store = create_session_store(
+        config_manager.get_session_config()
+    )
+    app.state.session_sweeper = asyncio.create_task(
+        sweep_sessions(app.state.session_store)
+    )
+
+    app.state.answer_cache = create_answer_cache(
+        config_manager.get_answer_cache_config()
+    )
+
+    llm_scheduler.configure(**config_manager.get_llm_scheduler_config())
+
+    app.state.retrieval_config = config_manager.get_retrieval_config()
+    app.state.graph_config = config_manager.get_graph_config()
+    app.state.enhancement_gate = EnhancementGate(
+        **config_manager.get_enhancement_gate_config()
+    )
+    history_config = config_manager.get_history_config()
+    app.state.history_manager = HistoryManager(
+        keep_last_turns=history_config.get("keep_last_turns", 6),
+        router_turns=history_config.get("router_turns", 2),
+        max_history_tokens=history_config.get("max_history_tokens", 2000),
+        summary_max_tokens=history_config.get("summary_max_tokens", 300),
+        compact_batch_turns=history_config.get("compact_batch_turns", 4),
+    )
 
     escalation_rules_path = Path(doc_config.get("escalation_rules_file"))
     escalation_rules = ""
@@ -100,8 +137,41 @@ async def startup_event():
         escalation_rules = escalation_rules_path.read_text()
     else:
         print(f"⚠️ Escalation rules file does not exist: {escalation_rules_path}")
+    app.state.escalation_rules = escalation_rules
+
+    # === LOAD DOCUMENTS AND LLM IN THE BACKGROUND ===
+    # The server starts accepting connections right away; /readyz reports
+    # when the knowledge base is loaded and the graph is compiled.
+    app.state.readiness = {
+        "knowledge_base": "pending",
+        "llm": "pending",
+        "graph": "pending",
+    }
+    app.state.initializer = asyncio.create_task(
+        initialize_dependencies(app, config_manager, google_api_key)
+    )
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    for task_name in (
+        "initializer",
+        "llm_warmup",
+        "knowledge_base_watcher",
+        "session_sweeper",
+    ):
+        task = getattr(app.state, task_name, None)
+        if task:
+            task.cancel()
+
+
+def create_llm(llm_config: dict, google_api_key: str):
+    """
+    Creates the Gemini chat model. langchain_google_genai is imported here
+    rather than at module level because it is slow to import.
+    """
+    from langchain_google_genai import ChatGoogleGenerativeAI
 
-    # === INITIALIZE GOOGLE AI ===
     try:
         print(f"Initializing Google AI with model: {llm_config.get('model')}")
         print(f"Temperature: {llm_config.get('temperature')}")
@@ -114,17 +184,13 @@ async def startup_event():
             google_api_key=google_api_key,  # Explicitly pass the key
             temperature=llm_config.get("temperature"),
             thinking_budget=0,
+            # One attempt per call: the LLM scheduler retries with backoff
+            # across all sessions, which the client cannot do on its own
+            max_retries=1,
         )
 
         print("✅ ChatGoogleGenerativeAI initialized successfully")
-
-        # Test the LLM with a simple call
-        try:
-            test_response = llm.invoke("Hello")
-            print("✅ Google AI test call successful")
-        except Exception as test_error:
-            print(f"⚠️ Google AI test call failed: {test_error}")
-            # Don't fail startup, but log the issue
+        return llm
 
     except Exception as e:
         print(f"❌ ERROR initializing Google AI: {e}")
@@ -136,15 +202,214 @@ async def startup_event():
         )
         raise
 
-    # === CREATE GRAPH ===
+
+async def warm_up_llm(app: FastAPI, timeout_seconds: float = 30):
+    """
+    Makes a first call so the client's connection is established before user
+    traffic arrives. A failed warm-up does not block readiness; the LLM is
+    reported as degraded instead.
+    """
     try:
-        app.state.graph = create_conversational_graph(
-            llm, full_doc_context, escalation_rules
+        await asyncio.wait_for(app.state.llm.ainvoke("Hello"), timeout_seconds)
+        app.state.readiness["llm"] = "ready"
+        print("✅ Google AI test call successful")
+    except Exception as e:
+        app.state.readiness["llm"] = "degraded"
+        print(f"⚠️ Google AI test call failed: {e}")
+
+
+async def initialize_dependencies(
+    app: FastAPI, config_manager: ConfigManager, google_api_key: str
+):
+    """
+    Creates the LLM, loads the knowledge base and compiles the graph after
+    the server has started. The LLM warm-up call runs alongside ingestion.
+    """
+    readiness = app.state.readiness
+    doc_config = config_manager.get_document_config()
+    step = "llm"
+    try:
+        # === INITIALIZE GOOGLE AI ===
+        readiness["llm"] = "initializing"
+        app.state.llm = await asyncio.to_thread(
+            create_llm, config_manager.get_llm_config(), google_api_key
+        )
+        readiness["llm"] = "warming_up"
+        app.state.llm_warmup = asyncio.create_task(warm_up_llm(app))
+
+        # === LOAD DOCUMENTS ===
+        step = "knowledge_base"
+        readiness["knowledge_base"] = "loading"
+        ocr_config = doc_config.get("ocr", {})
+        doc_source = LocalFileSource(
+            cache_dir=doc_config.get("cache_dir"),
+            max_workers=doc_config.get("ingest_workers"),
+            pdf_pages_per_task=doc_config.get("pdf_pages_per_task", 20),
+            ocr=ocr_config.get("enabled", True),
+            ocr_min_chars=ocr_config.get("min_chars", 20),
+            ocr_resolution=ocr_config.get("resolution", 300),
+            ocr_language=ocr_config.get("language", "eng"),
+        )
+        knowledge_base = KnowledgeBase(
+            Path(doc_config.get("knowledge_base_path")),
+            doc_source,
+            risk_engine=create_risk_engine(config_manager.get_risk_config()),
         )
+        await knowledge_base.load()
+        app.state.knowledge_base = knowledge_base
+        readiness["knowledge_base"] = "ready"
+
+        # === CREATE GRAPH ===
+        step = "graph"
+        readiness["graph"] = "building"
+        # Building the clause index is CPU-bound; keep the event loop free
+        app.state.graph = await asyncio.to_thread(build_graph, app.state)
+        app.state.graph_content_hash = knowledge_base.content_hash
+        readiness["graph"] = "ready"
         print("✅ Application dependencies initialized and graph compiled.")
-    except Exception as e:
-        print(f"❌ ERROR creating conversational graph: {e}")
+    except asyncio.CancelledError:
         raise
+    except Exception as e:
+        readiness[step] = "failed"
+        print(f"❌ ERROR initializing {step}: {e}")
+        return
+
+    # === WATCH KNOWLEDGE BASE ===
+    if doc_config.get("hot_reload", False):
+        app.state.knowledge_base_watcher = asyncio.create_task(
+            watch_knowledge_base(app)
+        )
+
+
+def is_ready(readiness: dict) -> bool:
+    return (
+        readiness["knowledge_base"] == "ready"
+        and readiness["graph"] == "ready"
+        and readiness["llm"] in ("ready", "degraded")
+    )
+
+
+def create_session_store(session_config: dict) -> SessionStore:
+    """
+    Creates the configured session store. The SQLite backend is shared by all
+    workers and survives restarts; the memory backend is per process.
+    """
+    idle_ttl_seconds = session_config.get("idle_ttl_seconds", 3600)
+    backend = session_config.get("backend", "memory")
+
+    if backend == "sqlite":
+        db_path = session_config.get("sqlite_path", "./data/sessions.db")
+        print(f"Using SQLite session store: {db_path}")
+        return SQLiteSessionStore(db_path, idle_ttl_seconds=idle_ttl_seconds)
+
+    max_memory_mb = session_config.get("max_memory_mb")
+    return InMemorySessionStore(
+        max_entries=session_config.get("max_entries", 1000),
+        idle_ttl_seconds=idle_ttl_seconds,
+        max_memory_bytes=max_memory_mb * 1024 * 1024 if max_memory_mb else None,
+    )
+
+
+def create_answer_cache(cache_config: dict) -> Optional[AnswerCache]:
+    """Creates the answer cache, or returns None when it is disabled."""
+    if not cache_config.get("enabled", True):
+        return None
+    return AnswerCache(
+        max_entries=cache_config.get("max_entries", 500),
+        ttl_seconds=cache_config.get("ttl_seconds", 3600),
+        similarity_threshold=cache_config.get("similarity_threshold"),
+        history_turns=cache_config.get("history_turns", 1),
+    )
+
+
+def create_risk_engine(risk_config: dict) -> Optional[RiskEngine]:
+    """Creates the document risk engine, or returns None when it is disabled."""
+    if not risk_config.get("enabled", True):
+        return None
+    rules_path = Path(risk_config.get("rules_file", "./config/risk-rules.json"))
+    if not rules_path.exists():
+        print(f"⚠️ Risk rules file does not exist: {rules_path}")
+        return None
+    print(f"Loading risk rules from: {rules_path.name}")
+    return RiskEngine.load(
+        str(rules_path),
+        medium_threshold=risk_config.get("medium_threshold", 4),
+        high_threshold=risk_config.get("high_threshold", 7),
+    )
+
+
+async def sweep_sessions(session_store: SessionStore, interval_seconds: float = 300):
+    """Periodically removes idle sessions from the store."""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            purged = await session_store.purge_expired()
+            if purged:
+                print(f"Purged {purged} idle sessions")
+        except Exception as e:
+            print(f"Error purging idle sessions: {e}")
+
+
+def build_graph(state):
+    """
+    Compiles the conversational graph from the current knowledge base, LLM
+    and escalation rules held in the application state.
+    """
+    knowledge_base = state.knowledge_base
+    retrieval_config = state.retrieval_config
+
+    clause_index = None
+    if retrieval_config.get("enabled", True):
+        clause_index = knowledge_base.build_clause_index(
+            max_clause_tokens=retrieval_config.get("max_clause_tokens", 400)
+        )
+        print(f"✅ Indexed {len(clause_index)} clauses for retrieval")
+
+    return create_conversational_graph(
+        state.llm,
+        knowledge_base.full_context(),
+        state.escalation_rules,
+        clause_index=clause_index,
+        retrieval_top_k=retrieval_config.get("top_k", 8),
+        retrieval_token_budget=retrieval_config.get("token_budget", 3000),
+        history_manager=state.history_manager,
+        mode=state.graph_config.get("mode", "sequential"),
+        defer_enhancement=getattr(state, "progressive_delivery", False),
+        enhancement_gate=getattr(state, "enhancement_gate", None),
+    )
+
+
+async def watch_knowledge_base(app: FastAPI):
+    """
+    Re-ingests changed knowledge base files and swaps in a freshly built graph.
+    Turns already running keep the graph they started with, and sessions are
+    not touched, so conversations carry on across reloads.
+    """
+    try:
+        from watchfiles import awatch
+    except ImportError:
+        print("⚠️ watchfiles is not installed - knowledge base hot reload disabled")
+        return
+
+    knowledge_base = app.state.knowledge_base
+    print(f"👀 Watching {knowledge_base.path} for document changes")
+    async for changes in awatch(knowledge_base.path, recursive=False):
+        try:
+            changed_paths = [Path(path) for _, path in changes]
+            if not await knowledge_base.refresh(changed_paths):
+                continue
+            content_hash = knowledge_base.content_hash
+            # Index building and compilation are CPU work; keep the loop free
+            graph = await asyncio.to_thread(build_graph, app.state)
+            # Swapped together with no await in between, so a turn always sees
+            # a graph with the content hash its answers are cached under
+            app.state.graph = graph
+            app.state.graph_content_hash = content_hash
+            if getattr(app.state, "answer_cache", None):
+                app.state.answer_cache.clear()
+            print(f"🔄 Knowledge base reloaded ({len(knowledge_base.documents)} documents)")
+        except Exception as e:
+            print(f"❌ ERROR reloading knowledge base: {e}")
 
 
 # Mount static files
@@ -166,58 +431,411 @@ async def send_status_update(websocket: WebSocket, status: str):
     await websocket.send_json({"type": "status_update", "status": status})
 
 
-@app.websocket("/ws")
-async def websocket_endpoint(websocket: WebSocket):
-    await websocket.accept()
-    session_id = str(uuid.uuid4())
-    sessions[session_id] = {
+def _chunk_text(chunk) -> str:
+    """Extracts plain text from a streamed message chunk."""
+    content = chunk.content
+    if isinstance(content, str):
+        return content
+    return "".join(
+        part.get("text", "") if isinstance(part, dict) else str(part)
+        for part in content
+    )
+
+
+async def run_graph(graph, state: dict, websocket: WebSocket) -> dict:
+    """
+    Runs the graph for one turn. In streaming mode, answer tokens are sent to
+    the client as `user_response_delta` frames while the graph is running.
+    """
+    started = time.perf_counter()
+    final_state = await _run_graph(graph, state, websocket)
+
+    if state.get("lawyer_message"):
+        message_type, decision = "lawyer_message", final_state.get("lawyer_feedback_type")
+    else:
+        message_type, decision = "user_message", final_state.get("decision")
+    TURN_DURATION.labels(
+        message_type=message_type, decision=decision or "unknown"
+    ).observe(time.perf_counter() - started)
+    return final_state
+
+
+async def _run_graph(graph, state: dict, websocket: WebSocket) -> dict:
+    if not getattr(websocket.app.state, "streaming", False):
+        return await graph.ainvoke(state)
+
+    final_state = None
+    # Speculative answer tokens, until the router decides (None once it has)
+    held = []
+    direct = False
+    async for event in graph.astream_events(state, version="v2"):
+        kind = event["event"]
+        # Tokens of a shared LLM call arrive as custom events for the callers
+        # that joined it, and as model stream events for the one that made it
+        if kind == "on_chat_model_stream" or (
+            kind == "on_custom_event" and event["name"] == SHARED_TOKEN
+        ):
+            node = event.get("metadata", {}).get("langgraph_node")
+            text = _chunk_text(event["data"]["chunk"])
+            if not text or STRUCTURED_OUTPUT_TAG in event.get("tags", []):
+                continue
+            if node == SPECULATIVE_NODE and held is not None:
+                held.append(text)
+            elif node in STREAMED_NODES or (node == SPECULATIVE_NODE and direct):
+                await websocket.send_json(
+                    {"type": "user_response_delta", "content": text}
+                )
+        elif kind == "on_custom_event" and event["name"] == SPECULATION_RESOLVED:
+            direct = event["data"]["decision"] == "answer_directly"
+            if direct and held:
+                await websocket.send_json(
+                    {"type": "user_response_delta", "content": "".join(held)}
+                )
+            held = None
+        elif kind == "on_chain_end" and not event.get("parent_ids"):
+            final_state = event["data"]["output"]
+
+    return final_state
+
+
+@lru_cache(maxsize=4)
+def escalation_matcher(escalation_rules: str) -> EscalationRules:
+    """The parsed escalation rules, compiled once per rules text."""
+    return EscalationRules.parse(escalation_rules)
+
+
+async def answer_from_cache(
+    websocket: WebSocket, session: dict, question: str, content_hash: str
+):
+    """
+    Returns the turn's final state from the answer cache, or None on a miss.
+    A hit updates the history the same way the graph's direct answer would.
+    `content_hash` is the knowledge base version of the turn's graph.
+    """
+    answer_cache = getattr(websocket.app.state, "answer_cache", None)
+    if answer_cache is None:
+        return None
+    # Questions with an escalation keyword must reach the graph's keyword
+    # router, however close they are to a cached question
+    if escalation_matcher(websocket.app.state.escalation_rules).match_keyword(question):
+        return None
+    started = time.perf_counter()
+    history = session["conversation_history"]
+    cached = answer_cache.get(question, history, content_hash)
+    if cached is None:
+        return None
+
+    await send_status_update(websocket, "direct_response")
+    TURN_DURATION.labels(message_type="user_message", decision="cached").observe(
+        time.perf_counter() - started
+    )
+    return {
+        "response_to_user": cached["response_to_user"],
+        "conversation_history": history
+        + [HumanMessage(content=question), AIMessage(content=cached["reply"])],
+        "escalated_question": None,
+        "prepared_briefing": None,
+    }
+
+
+def cache_answer(
+    websocket: WebSocket,
+    question: str,
+    history: list,
+    content_hash: str,
+    final_state: dict,
+    response: Optional[str] = None,
+):
+    """
+    Caches a directly answered question; escalations are never cached.
+    `content_hash` is the knowledge base version of the graph that answered,
+    so a turn that finishes after a reload never caches under the new one.
+    `response` replaces the turn's answer, e.g. once it has been amended.
+    """
+    answer_cache = getattr(websocket.app.state, "answer_cache", None)
+    if answer_cache is None or final_state.get("decision") != "answer_directly":
+        return
+    answer_cache.put(
+        question,
+        history,
+        content_hash,
+        {
+            "response_to_user": response or final_state["response_to_user"],
+            # The history keeps the answer before contextual enhancement
+            "reply": final_state["conversation_history"][-1].content,
+        },
+    )
+
+
+async def send_user_response(
+    websocket: WebSocket, final_state: dict, background: set, on_amended=None
+):
+    """
+    Sends the turn's answer. With progressive delivery the answer is the
+    base response, and its contextual enhancement runs in the background
+    and follows as an `answer_amendment` frame if it adds anything.
+    `on_amended` is called with the amended answer.
+    """
+    frame = {"type": "user_response", "content": final_state["response_to_user"]}
+    request = final_state.get("enhancement_request")
+    if request:
+        frame["answer_id"] = str(uuid.uuid4())
+    await websocket.send_json(frame)
+    if request:
+        # Scheduled only once the answer is out, so its amendment never
+        # reaches the client first
+        task = asyncio.create_task(
+            send_amendment(websocket, frame["answer_id"], request, on_amended)
+        )
+        background.add(task)
+        task.add_done_callback(background.discard)
+
+
+async def send_amendment(websocket: WebSocket, answer_id: str, request: dict, on_amended):
+    try:
+        enhanced = await enhance_response(
+            websocket.app.state.llm, **request, priority="background"
+        )
+    except Exception as e:
+        print(f"Error in background contextual enhancement: {e}")
+        return
+    if enhanced is None:
+        return
+    if on_amended is not None:
+        on_amended(enhanced)
+    try:
+        await websocket.send_json(
+            {"type": "answer_amendment", "answer_id": answer_id, "content": enhanced}
+        )
+    except Exception:
+        # The client disconnected; the session already holds the answer
+        pass
+
+
+def new_session() -> dict:
+    return {
         "conversation_history": [],
+        "history_summary": None,
         "escalated_question": None,
         "prepared_briefing": None,
         "lawyer_feedback_type": None,
         "lawyer_suggestions": None,
     }
 
+
+class SessionCompactor:
+    """
+    Folds a connection's older turns into the session's running summary in
+    a background task, so the summary call (queued at background priority)
+    never holds up the connection's next message. The result is applied to
+    the session between turns by apply(), keeping the turns added while the
+    summary was being written.
+    """
+
+    def __init__(self, app: FastAPI):
+        self.app = app
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self, session: dict):
+        """Starts compacting the session if it needs it and none is running."""
+        history_manager: HistoryManager = self.app.state.history_manager
+        history = session["conversation_history"]
+        if self._task is not None or not history_manager.needs_compaction(history):
+            return
+        self._task = asyncio.create_task(
+            self._compact(list(history), session.get("history_summary"))
+        )
+
+    async def _compact(self, history: list, summary: Optional[str]):
+        try:
+            compacted, summary = await self.app.state.history_manager.compact(
+                history, summary, self.app.state.llm
+            )
+        except Exception as e:
+            print(f"Error compacting conversation history: {e}")
+            return None
+        return history, compacted, summary
+
+    @property
+    def finished(self) -> bool:
+        return self._task is not None and self._task.done()
+
+    def apply(self, session: dict) -> bool:
+        """
+        Applies a finished compaction to the session. Returns True if it
+        changed the session.
+        """
+        if not self.finished:
+            return False
+        task, self._task = self._task, None
+        if task.cancelled() or task.result() is None:
+            return False
+        history, compacted, summary = task.result()
+        current = session["conversation_history"]
+        # The session may have moved on without this history (e.g. reset)
+        if len(compacted) == len(history) or current[: len(history)] != history:
+            return False
+        session["conversation_history"] = compacted + current[len(history) :]
+        session["history_summary"] = summary
+        return True
+
+    def cancel(self):
+        if self._task is not None:
+            self._task.cancel()
+
+
+@app.get("/healthz")
+async def healthz():
+    """Liveness: the process is up and serving requests."""
+    return {"status": "ok"}
+
+
+@app.get("/readyz")
+async def readyz():
+    """
+    Readiness: the knowledge base is loaded, the graph is compiled and the
+    LLM client is up. Returns 503 until then so no traffic is routed here.
+    """
+    readiness = getattr(app.state, "readiness", None)
+    if readiness is None or not is_ready(readiness):
+        return JSONResponse(
+            status_code=503, content={"status": "starting", "checks": readiness}
+        )
+    return {"status": "ready", "checks": readiness}
+
+
+@app.get("/sessions/stats")
+async def get_session_stats():
+    """Session store occupancy, hit and eviction counters."""
+    return await app.state.session_store.stats()
+
+
+@app.get("/metrics")
+async def get_metrics():
+    """Prometheus metrics: per-node latency, token usage, errors and routing."""
+    record_session_store_stats(await app.state.session_store.stats())
+    if getattr(app.state, "answer_cache", None):
+        record_answer_cache_stats(app.state.answer_cache.stats())
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
+@app.get("/answer-cache/stats")
+async def get_answer_cache_stats():
+    """Answer cache occupancy, exact/near-duplicate hits and evictions."""
+    answer_cache = getattr(app.state, "answer_cache", None)
+    return answer_cache.stats() if answer_cache else {"enabled": False}
+
+
+@app.get("/documents/risk")
+async def get_document_risk():
+    """Rule-based risk assessment of each knowledge base document."""
+    knowledge_base = getattr(app.state, "knowledge_base", None)
+    if knowledge_base is None:
+        return JSONResponse(status_code=503, content={"status": "starting"})
+    return [
+        {
+            "filename": document["filename"],
+            "risk_assessment": document.get("risk_assessment"),
+        }
+        for document in knowledge_base.documents
+    ]
+
+
+@app.get("/escalations/pending")
+async def get_pending_escalations():
+    """
+    Escalated questions still waiting for a lawyer's reply. Session ids are
+    not included: a session id is all it takes to resume a conversation.
+    """
+    return await app.state.session_store.pending_escalations()
+
+
+def resolve_session_id(websocket: WebSocket) -> str:
+    """
+    Reuses the session id the client reconnects with (so a conversation can
+    continue on any worker), or issues a new one.
+    """
+    requested = websocket.query_params.get("session_id")
+    try:
+        return str(uuid.UUID(requested))
+    except (TypeError, ValueError):
+        return str(uuid.uuid4())
+
+
+@app.websocket("/ws")
+async def websocket_endpoint(websocket: WebSocket):
+    await websocket.accept()
+    session_store: SessionStore = websocket.app.state.session_store
+    session_id = resolve_session_id(websocket)
+    if await session_store.get(session_id) is None:
+        await session_store.save(session_id, new_session())
+    await websocket.send_json({"type": "session", "session_id": session_id})
+    # Enhancements still running for answers already sent (progressive delivery)
+    background = set()
+    compactor = SessionCompactor(websocket.app)
+
     try:
         while True:
             data = await websocket.receive_json()
             message_type = data.get("type")
             content = data.get("content")
 
-            # Get the graph from the application state
-            graph = websocket.app.state.graph
+            # Get the graph, and the knowledge base version it was built from,
+            # from the application state
+            graph = getattr(websocket.app.state, "graph", None)
+            content_hash = getattr(websocket.app.state, "graph_content_hash", None)
+            if graph is None:
+                await websocket.send_json(
+                    {
+                        "type": "error",
+                        "content": "Lumen is still starting up. Please try again in a moment.",
+                    }
+                )
+                continue
+
+            # The session may have been evicted while idle; start afresh if so
+            session = await session_store.get(session_id) or new_session()
+            if compactor.apply(session):
+                await session_store.save(session_id, session)
 
             if message_type == "user_message":
                 current_state = {
                     "user_message": content,
                     "lawyer_message": None,
-                    "conversation_history": sessions[session_id][
-                        "conversation_history"
-                    ],
-                    "escalated_question": sessions[session_id].get(
-                        "escalated_question"
-                    ),
-                    "prepared_briefing": sessions[session_id].get("prepared_briefing"),
+                    "conversation_history": session["conversation_history"],
+                    "history_summary": session.get("history_summary"),
+                    "escalated_question": session.get("escalated_question"),
+                    "prepared_briefing": session.get("prepared_briefing"),
                     "websocket": websocket,  # Pass websocket for status updates
                 }
 
-                final_state = graph.invoke(current_state)
-
-                sessions[session_id]["conversation_history"] = final_state[
-                    "conversation_history"
-                ]
-                sessions[session_id]["escalated_question"] = final_state.get(
-                    "escalated_question"
-                )
-                sessions[session_id]["prepared_briefing"] = final_state.get(
-                    "prepared_briefing"
+                final_state = await answer_from_cache(
+                    websocket, session, content, content_hash
                 )
+                if final_state is None:
+                    final_state = await run_graph(graph, current_state, websocket)
+                    cache_answer(
+                        websocket,
+                        content,
+                        session["conversation_history"],
+                        content_hash,
+                        final_state,
+                    )
 
-                await websocket.send_json(
-                    {
-                        "type": "user_response",
-                        "content": final_state["response_to_user"],
-                    }
+                history = session["conversation_history"]
+                session["conversation_history"] = final_state["conversation_history"]
+                session["escalated_question"] = final_state.get("escalated_question")
+                session["prepared_briefing"] = final_state.get("prepared_briefing")
+                await session_store.save(session_id, session)
+
+                await send_user_response(
+                    websocket,
+                    final_state,
+                    background,
+                    # Later hits on the answer cache get the amended answer
+                    on_amended=partial(
+                        cache_answer, websocket, content, history, content_hash, final_state
+                    ),
                 )
 
                 if final_state.get("message_to_lawyer"):
@@ -228,41 +846,36 @@ async def websocket_endpoint(websocket: WebSocket):
                         }
                     )
 
+                compactor.start(session)
+
             elif message_type == "lawyer_message":
 
                 current_state = {
                     "user_message": None,
                     "lawyer_message": content,
-                    "conversation_history": sessions[session_id][
-                        "conversation_history"
-                    ],
-                    "escalated_question": sessions[session_id].get(
-                        "escalated_question"
-                    ),
-                    "prepared_briefing": sessions[session_id].get("prepared_briefing"),
+                    "conversation_history": session["conversation_history"],
+                    "history_summary": session.get("history_summary"),
+                    "escalated_question": session.get("escalated_question"),
+                    "prepared_briefing": session.get("prepared_briefing"),
                     "websocket": websocket,
                 }
 
                 try:
-                    final_state = graph.invoke(current_state)
+                    final_state = await run_graph(graph, current_state, websocket)
 
                     # Update session state from final_state (the nodes will clear what they need to)
-                    sessions[session_id]["conversation_history"] = final_state[
+                    session["conversation_history"] = final_state[
                         "conversation_history"
                     ]
-                    sessions[session_id]["escalated_question"] = final_state.get(
+                    session["escalated_question"] = final_state.get(
                         "escalated_question"
                     )
-                    sessions[session_id]["prepared_briefing"] = final_state.get(
-                        "prepared_briefing"
-                    )
+                    session["prepared_briefing"] = final_state.get("prepared_briefing")
+                    await session_store.save(session_id, session)
 
-                    await websocket.send_json(
-                        {
-                            "type": "user_response",
-                            "content": final_state["response_to_user"],
-                        }
-                    )
+                    await send_user_response(websocket, final_state, background)
+
+                    compactor.start(session)
                 except Exception as e:
                     print(f"Error processing lawyer message: {e}")
                     print(f"Current state: {current_state}")
@@ -274,13 +887,21 @@ async def websocket_endpoint(websocket: WebSocket):
                     )
 
     except WebSocketDisconnect:
+        # The session is kept so the client can reconnect and resume it;
+        # the store's idle TTL removes abandoned sessions.
         print(f"Client {session_id} disconnected")
-        if session_id in sessions:
-            del sessions[session_id]
     except Exception as e:
         print(f"An error occurred with client {session_id}: {e}")
         await websocket.send_json(
             {"type": "error", "content": f"An unexpected error occurred: {str(e)}"}
         )
-        if session_id in sessions:
-            del sessions[session_id]
+        await session_store.delete(session_id)
+    finally:
+        for task in background:
+            task.cancel()
+        # Keep a summary that was finished after the last turn
+        if compactor.finished:
+            session = await session_store.get(session_id)
+            if session is not None and compactor.apply(session):
+                await session_store.save(session_id, session)
+        compactor.cancel()
@@ -30,18 +30,30 @@ if __name__ == "__main__":
     # Determine if we're in production
     is_production = os.environ.get("RAILWAY_ENVIRONMENT_NAME") is not None
 
+    workers = int(os.environ.get("WEB_CONCURRENCY", web_config.get("workers", 1)))
+    session_backend = config.get_session_config().get("backend", "memory")
+    if workers > 1 and session_backend == "memory":
+        print(
+            "⚠️ In-memory sessions cannot be shared between workers - "
+            "set sessions.backend to 'sqlite'. Falling back to 1 worker."
+        )
+        workers = 1
+    reload = False if is_production or workers > 1 else web_config.get("reload", True)
+
     print("🚀 Starting Legal Contract Analysis Bot Web Interface...")
     print(f"📁 Configuration loaded from: config/config.yaml")
     print(f"🌐 Server will start at: http://{host}:{port}")
     print(
         f"🔧 Environment: {'Production (Railway)' if is_production else 'Development'}"
     )
+    print(f"👷 Workers: {workers}")
 
     # Run the FastAPI application
     uvicorn.run(
         "implementations.web.main:app",
         host=host,
         port=port,
-        reload=False if is_production else web_config.get("reload", True),
+        reload=reload,
+        workers=workers,
         log_level="info",
     )
@@ -16,6 +16,7 @@ def create_directories():
         "data/analyses",
         "data/uploads",
         "data/knowledge_base",
+        "data/cache",
         "logs",
         "static/css",
         "static/js",
@@ -92,6 +93,7 @@ __pycache__/
 # Data and uploads (but keep knowledge_base)
 data/analyses/
 data/uploads/
+data/cache/
 logs/
 *.log
 
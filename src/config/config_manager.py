@@ -48,3 +48,24 @@ class ConfigManager:
 
     def get_risk_config(self) -> Dict[str, Any]:
         return self.get("risk_assessment", {})
+
+    def get_retrieval_config(self) -> Dict[str, Any]:
+        return self.get("retrieval", {})
+
+    def get_graph_config(self) -> Dict[str, Any]:
+        return self.get("graph", {})
+
+    def get_enhancement_gate_config(self) -> Dict[str, Any]:
+        return self.get("enhancement_gate", {})
+
+    def get_session_config(self) -> Dict[str, Any]:
+        return self.get("sessions", {})
+
+    def get_history_config(self) -> Dict[str, Any]:
+        return self.get("history", {})
+
+    def get_answer_cache_config(self) -> Dict[str, Any]:
+        return self.get("answer_cache", {})
+
+    def get_llm_scheduler_config(self) -> Dict[str, Any]:
+        return self.get("llm_scheduler", {})
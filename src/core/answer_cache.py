@@ -0,0 +1,250 @@
+import hashlib
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+from langchain_core.messages import BaseMessage
+
+from retrieval.clause_index import TOKEN_PATTERN, tokenize
+
+from .history_manager import split_turns
+
+QUESTION_WORDS = {"what", "when", "how", "which", "who", "why", "where", "can"}
+
+# "Can we end it with notice?" and "Can we end it without notice?" are near
+# duplicates with opposite answers; "can't" and other "n't" words count too
+NEGATIONS = {"not", "no", "without", "non", "never", "nor", "cannot", "neither"}
+
+# Who acts and in which direction: "Can we ..." / "Can you ...", "notice
+# to the supplier" / "notice from the supplier"
+PARTY_WORDS = {
+    "i", "we", "us", "our", "you", "your", "from", "to", "by", "against", "for",
+}
+
+# Capitalized terms, typically party and contract names ("IBM", "Acme Ltd")
+CAPITALIZED = re.compile(r"\b[A-Z][A-Za-z0-9&-]*")
+
+# Words that make a question depend on the previous turn ("what about
+# that clause?"); such questions are only shared when the history matches.
+FOLLOW_UP = re.compile(
+    r"\b(it|its|this|that|these|those|they|them|their|he|she|him|her|above|"
+    r"previous|same|also|else|again|there)\b|^\s*(and|but|so|what about|how about)\b",
+    re.IGNORECASE,
+)
+
+NUMBER = re.compile(r"\d+(?:[.,]\d+)*")
+
+
+def normalize_query(query: str) -> str:
+    """
+    Canonical form of a question: lowercased, with punctuation and extra
+    whitespace dropped, so "What is the notice period?" and "what is the
+    notice period" are the same question. Every word is kept: "we" / "you"
+    and "from" / "to" change what the answer should say.
+    """
+    return " ".join(TOKEN_PATTERN.findall(query.lower().replace("’", "'")))
+
+
+def is_follow_up(query: str) -> bool:
+    return bool(FOLLOW_UP.search(query)) or len(tokenize(query)) < 2
+
+
+def _features(query: str) -> FrozenSet[str]:
+    """
+    Character trigrams of each normalized word, used for near-duplicate
+    matching. They are insensitive to word order and tolerate inflections
+    ("terminating" / "termination").
+    """
+    trigrams = set()
+    for word in normalize_query(query).split():
+        padded = f" {word} "
+        trigrams.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return frozenset(trigrams)
+
+
+def _distinguishing_terms(query: str) -> FrozenSet[str]:
+    """
+    Capitalized terms and party words of a question. Swapping a short name
+    ("the IBM agreement" / "the HP agreement") hardly changes the trigram
+    overlap, so near duplicates must name exactly the same ones. The first
+    word of a sentence only counts when it is capitalized past its first
+    letter ("IBM").
+    """
+    terms = set()
+    for sentence in re.split(r"[.?!]\s+", query.strip()):
+        for match in CAPITALIZED.finditer(sentence):
+            term = match.group(0)
+            if match.start() > 0 or term[1:] != term[1:].lower():
+                terms.add(term.lower())
+    terms.update(word for word in normalize_query(query).split() if word in PARTY_WORDS)
+    return frozenset(terms)
+
+
+def _guards(query: str) -> Tuple[FrozenSet[str], ...]:
+    """
+    Numbers, question words, negations and distinguishing terms, which must
+    agree for a near-duplicate.
+    """
+    words = normalize_query(query).split()
+    return (
+        frozenset(NUMBER.findall(query)),
+        frozenset(word for word in words if word in QUESTION_WORDS),
+        frozenset(
+            "not" if word.endswith("n't") else word
+            for word in words
+            if word in NEGATIONS or word.endswith("n't")
+        ),
+        _distinguishing_terms(query),
+    )
+
+
+def _jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class AnswerCache:
+    """
+    Caches final answers to user questions in front of the graph.
+
+    Entries are scoped by the knowledge base content hash, so answers about
+    documents that have since changed are never served, and for follow-up
+    questions also by the last `history_turns` turns of the conversation.
+    Within a scope a question hits either exactly (same normalized text) or,
+    if `similarity_threshold` is set, as a near duplicate: the Jaccard
+    similarity of their character trigrams is at least the threshold and
+    they agree on numbers, question words, negations, party words and
+    capitalized names. Entries expire after `ttl_seconds` and the least
+    recently used are evicted beyond `max_entries`.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 500,
+        ttl_seconds: Optional[float] = 3600,
+        similarity_threshold: Optional[float] = None,
+        history_turns: int = 1,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.similarity_threshold = similarity_threshold
+        self.history_turns = history_turns
+        # key -> entry dict; least recently used first
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._counters = {
+            "hits_exact": 0,
+            "hits_similar": 0,
+            "misses": 0,
+            "evictions_ttl": 0,
+            "evictions_capacity": 0,
+            "invalidations": 0,
+        }
+
+    def _scope(self, query: str, history: List[BaseMessage], content_hash: str) -> str:
+        digest = hashlib.sha256(content_hash.encode())
+        if is_follow_up(query) and self.history_turns > 0:
+            for turn in split_turns(history)[-self.history_turns :]:
+                for message in turn:
+                    digest.update(normalize_query(str(message.content)).encode())
+                    digest.update(b"\0")
+        return digest.hexdigest()
+
+    def get(
+        self, query: str, history: List[BaseMessage], content_hash: str
+    ) -> Optional[Dict[str, Any]]:
+        """The cached answer for `query`, or None."""
+        self._purge_expired()
+        scope = self._scope(query, history, content_hash)
+        key = f"{scope}:{normalize_query(query)}"
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._counters["hits_exact"] += 1
+        elif self.similarity_threshold:
+            entry = self._most_similar(scope, query)
+            if entry is not None:
+                self._counters["hits_similar"] += 1
+        if entry is None:
+            self._counters["misses"] += 1
+            return None
+
+        self._entries.move_to_end(entry["key"])
+        return entry["value"]
+
+    def _most_similar(self, scope: str, query: str) -> Optional[Dict[str, Any]]:
+        features = _features(query)
+        numbers, question_words, negations, terms = _guards(query)
+        best, best_score = None, 0.0
+        for entry in self._entries.values():
+            if (
+                entry["scope"] != scope
+                or entry["numbers"] != numbers
+                or entry["negations"] != negations
+                or entry["terms"] != terms
+            ):
+                continue
+            # "When ..." and "How ..." about the same clause want different answers
+            if question_words and entry["question_words"] and (
+                question_words != entry["question_words"]
+            ):
+                continue
+            score = _jaccard(features, entry["features"])
+            if score >= self.similarity_threshold and score > best_score:
+                best, best_score = entry, score
+        return best
+
+    def put(
+        self,
+        query: str,
+        history: List[BaseMessage],
+        content_hash: str,
+        value: Dict[str, Any],
+    ) -> None:
+        scope = self._scope(query, history, content_hash)
+        key = f"{scope}:{normalize_query(query)}"
+        numbers, question_words, negations, terms = _guards(query)
+        self._entries.pop(key, None)
+        self._entries[key] = {
+            "key": key,
+            "scope": scope,
+            "features": _features(query),
+            "numbers": numbers,
+            "question_words": question_words,
+            "negations": negations,
+            "terms": terms,
+            "value": value,
+            "stored_at": time.monotonic(),
+        }
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._counters["evictions_capacity"] += 1
+
+    def clear(self) -> int:
+        """Drops every entry, e.g. after the knowledge base changed."""
+        dropped = len(self._entries)
+        self._entries.clear()
+        self._counters["invalidations"] += dropped
+        return dropped
+
+    def stats(self) -> Dict[str, Any]:
+        hits = self._counters["hits_exact"] + self._counters["hits_similar"]
+        lookups = hits + self._counters["misses"]
+        return {
+            "entries": len(self._entries),
+            "hit_rate": hits / lookups if lookups else 0.0,
+            **self._counters,
+        }
+
+    def _purge_expired(self):
+        if not self.ttl_seconds:
+            return
+        cutoff = time.monotonic() - self.ttl_seconds
+        # Entries are re-inserted on put but only moved on get, so scan them all
+        expired = [
+            key for key, entry in self._entries.items() if entry["stored_at"] <= cutoff
+        ]
+        for key in expired:
+            del self._entries[key]
+        self._counters["evictions_ttl"] += len(expired)
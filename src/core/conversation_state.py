@@ -11,11 +11,19 @@ class ConversationState(TypedDict):
 
     # The history of messages for this session.
     conversation_history: List[BaseMessage]
+    # Running summary of older turns that were folded out of the history
+    history_summary: Optional[str]
+
+    # Contract context selected for the current turn
+    doc_context: Optional[str]
 
     # Input for the current turn from either user or lawyer
     user_message: Optional[str]
     lawyer_message: Optional[str]
 
+    # Routing decision for a user message ("answer_directly" / "escalate_to_lawyer")
+    decision: Optional[str]
+
     # Output generated during the current turn
     response_to_user: str
     message_to_lawyer: Optional[str]
@@ -30,6 +38,9 @@ class ConversationState(TypedDict):
 
     # Base response before contextual enhancement
     base_response: Optional[str]
+    # Inputs for contextual enhancement when it is deferred until after the
+    # base response has been sent (progressive delivery)
+    enhancement_request: Optional[dict]
     # NEW: Lawyer feedback handling
     lawyer_feedback_type: Optional[str]
     lawyer_suggestions: Optional[str]
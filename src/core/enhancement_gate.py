@@ -0,0 +1,164 @@
+import random
+import re
+from typing import Optional, Set
+
+from .metrics import ENHANCEMENT_GATE
+
+GATE_MODES = ("off", "shadow", "enforce")
+
+# Query categories. Enhancements are only ever about operational facts, and
+# the enhancement prompt forbids them for questions needing legal judgement.
+CATEGORIES = [
+    (
+        "legal_judgement",
+        re.compile(
+            r"\b(liabilit|liable|indemn|dispute|breach|damages|litigat|arbitrat|"
+            r"warrant|sue|court|lawsuit|negligen)",
+            re.IGNORECASE,
+        ),
+    ),
+    (
+        "deadline",
+        re.compile(
+            r"\b(when|deadline|notice|period|term|terminat|renew|expir|days?|"
+            r"months?|years?|date|how long)\b",
+            re.IGNORECASE,
+        ),
+    ),
+    (
+        "payment",
+        re.compile(
+            r"\b(pay|paid|payment|fee|fees|invoice|price|cost|charge|amount|"
+            r"interest|refund)",
+            re.IGNORECASE,
+        ),
+    ),
+]
+
+# Answers that ask the user for more detail or report that the contract is
+# silent have nothing to enhance
+CLARIFICATION = re.compile(
+    r"^\s*(i need more|could you|can you (tell|clarify|confirm)|are you asking|"
+    r"do you mean|which (one|agreement|contract))",
+    re.IGNORECASE,
+)
+NOT_FOUND = re.compile(
+    r"\b(i (don't|do not|can't|cannot) (see|find)|(is|are) not (specified|covered|"
+    r"addressed|mentioned)|doesn't (say|specify|mention))",
+    re.IGNORECASE,
+)
+
+CLAUSE_REFERENCE = re.compile(r"\b(section|clause|article|schedule)\s+\d", re.IGNORECASE)
+
+# Deadlines and amounts: the facts an enhancement adds
+FACT = re.compile(
+    r"\b\d+(?:[.,]\d+)*\)?\s*(?:business\s+|calendar\s+|working\s+)?"
+    r"(?:days?|weeks?|months?|years?|hours?)\b"
+    r"|[$€£]\s?\d[\d,]*(?:\.\d+)?(?:\s*(?:million|billion|thousand|[mk])\b)?"
+    r"|\b\d+(?:\.\d+)?\s?%",
+    re.IGNORECASE,
+)
+
+
+def _facts(text: str) -> Set[str]:
+    # "thirty (30) days" and "30 days" are the same fact
+    return {
+        re.sub(r"\s+", " ", fact.lower().replace(")", ""))
+        for fact in FACT.findall(text or "")
+    }
+
+
+def query_category(query: str) -> str:
+    for name, pattern in CATEGORIES:
+        if pattern.search(query or ""):
+            return name
+    return "other"
+
+
+class GateDecision:
+    """The gate's prediction for one answer; record() logs the LLM's verdict."""
+
+    def __init__(self, category: str, reason: Optional[str]):
+        self.category = category
+        # Why no enhancement is expected, or None if one might help
+        self.reason = reason
+
+    @property
+    def prediction(self) -> str:
+        return "skip" if self.reason else "enhance"
+
+    def record(self, enhanced: Optional[str]):
+        """Logs the prediction against the LLM's result (None = not needed)."""
+        result = "no_enhancement" if enhanced is None else "enhanced"
+        ENHANCEMENT_GATE.labels(
+            category=self.category, prediction=self.prediction, llm_result=result
+        ).inc()
+        if (self.prediction == "skip") != (enhanced is None):
+            print(
+                f"Enhancement gate mispredicted {self.prediction} "
+                f"({self.reason or self.category}): LLM returned {result}"
+            )
+
+
+class EnhancementGate:
+    """
+    Predicts from cheap local features whether contextual enhancement will
+    add anything, so its LLM call can be skipped.
+
+    An answer is predicted not to need enhancement when the question needs
+    legal judgement, the answer asks for clarification or says the contract
+    is silent, the answer is already long, or the retrieved contract text
+    holds no deadline or amount that the answer does not already mention.
+
+    In "shadow" mode the LLM is always called and every prediction is
+    recorded against its result in `lumen_enhancement_gate_total`. In
+    "enforce" mode predicted skips save the call, except for an
+    `audit_rate` sample that still goes to the LLM to keep measuring
+    accuracy.
+    """
+
+    def __init__(
+        self,
+        mode: str = "shadow",
+        audit_rate: float = 0.05,
+        max_answer_words: int = 60,
+    ):
+        if mode not in GATE_MODES:
+            raise ValueError(f"Unknown enhancement gate mode: {mode}")
+        self.mode = mode
+        self.audit_rate = audit_rate
+        self.max_answer_words = max_answer_words
+
+    def predict(self, query: str, answer: str, doc_context: str) -> Optional[GateDecision]:
+        if self.mode == "off":
+            return None
+        category = query_category(query)
+        return GateDecision(category, self._skip_reason(category, answer, doc_context))
+
+    def _skip_reason(self, category: str, answer: str, doc_context: str) -> Optional[str]:
+        if category == "legal_judgement":
+            return "legal judgement"
+        if CLARIFICATION.search(answer):
+            return "clarification"
+        if NOT_FOUND.search(answer):
+            return "not in contract"
+        if len(answer.split()) > self.max_answer_words:
+            return "long answer"
+        if not _facts(doc_context) - _facts(answer):
+            return "no further deadlines or amounts"
+        # A cited answer to an open question is usually complete
+        if category == "other" and CLAUSE_REFERENCE.search(answer):
+            return "cited answer"
+        return None
+
+    def skips(self, decision: Optional[GateDecision]) -> bool:
+        """Whether to skip the LLM call for this decision."""
+        if decision is None or decision.prediction != "skip" or self.mode != "enforce":
+            return False
+        if random.random() < self.audit_rate:
+            return False
+        ENHANCEMENT_GATE.labels(
+            category=decision.category, prediction="skip", llm_result="skipped"
+        ).inc()
+        print(f"Enhancement gate: skipping contextual enhancement ({decision.reason})")
+        return True
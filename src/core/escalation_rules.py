@@ -0,0 +1,76 @@
+import re
+from typing import List, Optional
+
+# Words that may appear between the parts of a multi-word keyword, so that
+# "terminate contract" also matches "terminate the contract".
+_FILLER = r"(?:(?:the|our|this|that|a|an|their|its|my|your)\s+)?"
+_JOINER = r"[\s\-]*" + _FILLER
+
+
+def _word_pattern(word: str) -> str:
+    """Regex for a keyword word plus its common inflections."""
+    word = word.lower()
+    if len(word) > 3 and word.endswith("y"):
+        return re.escape(word[:-1]) + r"(?:y|ies|ied)"
+    if len(word) > 2 and word.endswith("e"):
+        return re.escape(word[:-1]) + r"(?:e|es|ed|ing|ion|ions)"
+    return re.escape(word) + r"(?:s|es|ed|ing)?"
+
+
+def _keyword_pattern(keyword: str) -> str:
+    words = re.split(r"[\s\-]+", keyword.strip())
+    return r"\b" + _JOINER.join(_word_pattern(word) for word in words) + r"\b"
+
+
+class EscalationRules:
+    """
+    Parsed form of config/escalation-rules.txt.
+
+    The "Keywords" section is compiled into a single regex so that queries
+    mentioning an escalation topic can be routed without an LLM call. The
+    "Intents" section needs judgement and is left to the LLM router.
+    """
+
+    def __init__(self, keywords: List[str], intents: List[str]):
+        self.keywords = keywords
+        self.intents = intents
+        # Longest keywords first so "unlimited liability" wins over "liability"
+        ordered = sorted(keywords, key=len, reverse=True)
+        self._group_keywords = {f"k{i}": keyword for i, keyword in enumerate(ordered)}
+        self._pattern = (
+            re.compile(
+                "|".join(
+                    f"(?P<{group}>{_keyword_pattern(keyword)})"
+                    for group, keyword in self._group_keywords.items()
+                ),
+                re.IGNORECASE,
+            )
+            if ordered
+            else None
+        )
+
+    @classmethod
+    def parse(cls, text: str) -> "EscalationRules":
+        keywords, intents = [], []
+        section = keywords
+        for raw_line in text.splitlines():
+            line = raw_line.strip()
+            if line.startswith("#"):
+                heading = line.lower()
+                if "intent" in heading:
+                    section = intents
+                elif "keyword" in heading:
+                    section = keywords
+                continue
+            if line.startswith("-"):
+                item = line.lstrip("-").strip()
+                if item:
+                    section.append(item)
+        return cls(keywords, intents)
+
+    def match_keyword(self, query: str) -> Optional[str]:
+        """Returns the escalation keyword found in the query, if any."""
+        if not self._pattern or not query:
+            return None
+        match = self._pattern.search(query)
+        return self._group_keywords[match.lastgroup] if match else None
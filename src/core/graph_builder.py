@@ -1,8 +1,15 @@
 from functools import partial
+from typing import Optional
 from langgraph.graph import StateGraph, START, END
-from langchain_google_genai import ChatGoogleGenerativeAI
+from langchain_core.language_models import BaseChatModel
+
+from retrieval.clause_index import ClauseIndex
 
 from .conversation_state import ConversationState
+from .enhancement_gate import EnhancementGate
+from .escalation_rules import EscalationRules
+from .history_manager import HistoryManager
+from .metrics import TokenUsageCallback, instrument_node
 from .graph_nodes import (
     approve_briefing_node,
     escalation_router_node,
@@ -11,8 +18,23 @@ from .graph_nodes import (
     contextual_enhancement_node,
     lawyer_feedback_router_node,
     process_corrections_node,
+    retrieve_context_node,
+    route_and_answer_node,
+    speculative_router_node,
 )
 
+# "sequential": an LLM router call, then the answer call on direct turns.
+# "combined": one structured call that routes and drafts the answer.
+# "speculative": the router and answer calls run at the same time.
+GRAPH_MODES = ("sequential", "combined", "speculative")
+
+# Graph node that routes user questions, and the function behind it, by mode
+ROUTER_NODES = {
+    "sequential": ("router", escalation_router_node),
+    "combined": ("route_and_answer", route_and_answer_node),
+    "speculative": ("speculative_router", speculative_router_node),
+}
+
 
 def should_escalate(state: dict) -> str:
     """Conditional edge to decide the path after routing."""
@@ -29,6 +51,15 @@ def route_lawyer_feedback(state: dict) -> str:
     return feedback_type
 
 
+def needs_enhancement(state: dict) -> str:
+    """
+    Conditional edge after an approval: an answer taken verbatim from the
+    approved briefing is final, anything else is enhanced. An empty LLM
+    answer is enhanced too, where it becomes an error message.
+    """
+    return END if state.get("response_to_user") else "contextual_enhancement"
+
+
 def get_entry_point(state: dict) -> str:
     """Conditional entry point for user vs. lawyer messages."""
     if state.get("lawyer_message"):
@@ -37,58 +68,117 @@ def get_entry_point(state: dict) -> str:
 
 
 def create_conversational_graph(
-    llm: ChatGoogleGenerativeAI, doc_context: str, escalation_rules: str
+    llm: BaseChatModel,
+    doc_context: str,
+    escalation_rules: str,
+    clause_index: Optional[ClauseIndex] = None,
+    retrieval_top_k: int = 8,
+    retrieval_token_budget: int = 3000,
+    history_manager: Optional[HistoryManager] = None,
+    mode: str = "sequential",
+    defer_enhancement: bool = False,
+    enhancement_gate: Optional[EnhancementGate] = None,
 ):
     """
     Creates the LangGraph agent for the legal bot.
+
+    All nodes are coroutines, so the compiled graph must be run with
+    `graph.ainvoke(...)` from inside the event loop.
+
+    When a clause index is given, each turn starts by retrieving the clauses
+    relevant to the query (within `retrieval_token_budget` tokens) and only
+    those are put in the prompts. Otherwise the full `doc_context` is used.
+
+    The history manager decides how much conversation history the router and
+    answer prompts see; without one they see the full history.
+
+    `mode` selects how user questions are routed (see GRAPH_MODES). In
+    "combined" mode a single `route_and_answer` node takes the place of the
+    router and answer nodes, and only escalations make a second call. In
+    "speculative" mode the `speculative_router` node drafts the answer while
+    the router decides, and throws the draft away on escalation.
+
+    With `defer_enhancement`, the contextual enhancement node returns the
+    base response as the answer and leaves the enhancement to the caller
+    (progressive delivery); see `enhancement_request` in the state. The
+    enhancement gate predicts when the enhancement can be skipped.
+
+    Every node's latency, errors and LLM token usage are recorded in the
+    Prometheus metrics defined in `core.metrics`.
     """
+    if mode not in GRAPH_MODES:
+        raise ValueError(f"Unknown graph mode: {mode}")
+
     workflow = StateGraph(ConversationState)
 
     # Bind the LLM and context to the node functions
+    retrieve_node = partial(
+        retrieve_context_node,
+        doc_context=doc_context,
+        clause_index=clause_index,
+        top_k=retrieval_top_k,
+        token_budget=retrieval_token_budget,
+    )
+    router_name, router_function = ROUTER_NODES[mode]
     router_node = partial(
-        escalation_router_node,
+        router_function,
         llm=llm,
         escalation_rules=escalation_rules,
+        escalation_matcher=EscalationRules.parse(escalation_rules),
+        history_manager=history_manager,
     )
-    answer_node = partial(generate_direct_answer_node, llm=llm, doc_context=doc_context)
-    briefing_node = partial(
-        generate_lawyer_briefing_node, llm=llm, doc_context=doc_context
+    answer_node = partial(
+        generate_direct_answer_node, llm=llm, history_manager=history_manager
     )
+    briefing_node = partial(generate_lawyer_briefing_node, llm=llm)
     # NEW: Lawyer feedback nodes
     lawyer_router_node = partial(lawyer_feedback_router_node, llm=llm)
     approve_node = partial(approve_briefing_node, llm=llm)
-    corrections_node = partial(
-        process_corrections_node, llm=llm, doc_context=doc_context
-    )
+    corrections_node = partial(process_corrections_node, llm=llm)
 
     contextual_node = partial(
-        contextual_enhancement_node, llm=llm, doc_context=doc_context
+        contextual_enhancement_node,
+        llm=llm,
+        defer=defer_enhancement,
+        gate=enhancement_gate,
     )
 
-    # Add nodes to the graph
-    workflow.add_node("router", router_node)
-    workflow.add_node("answer", answer_node)
-    workflow.add_node("generate_briefing", briefing_node)
-    # NEW: Replace handle_lawyer_response with router + handlers
-    workflow.add_node("lawyer_feedback_router", lawyer_router_node)
-    workflow.add_node("approve_briefing", approve_node)
-    workflow.add_node("provide_corrections", corrections_node)
-    workflow.add_node("contextual_enhancement", contextual_node)
+    # Add nodes to the graph, each timed for the /metrics endpoint
+    nodes = {
+        "retrieve_context": retrieve_node,
+        "generate_briefing": briefing_node,
+        # NEW: Replace handle_lawyer_response with router + handlers
+        "lawyer_feedback_router": lawyer_router_node,
+        "approve_briefing": approve_node,
+        "provide_corrections": corrections_node,
+        "contextual_enhancement": contextual_node,
+    }
+    nodes[router_name] = router_node
+    if mode == "sequential":
+        answer_name = "answer"
+        nodes[answer_name] = answer_node
+    else:
+        # The routing node has already produced the answer
+        answer_name = "contextual_enhancement"
+    for name, node in nodes.items():
+        workflow.add_node(name, instrument_node(name, node))
 
     # Define the graph's topology
-    workflow.set_conditional_entry_point(
+    workflow.add_edge(START, "retrieve_context")
+    workflow.add_conditional_edges(
+        "retrieve_context",
         get_entry_point,
         {
-            "router": "router",
+            "router": router_name,
             "lawyer_feedback_router": "lawyer_feedback_router",
         },
     )
     workflow.add_conditional_edges(
-        "router",
+        router_name,
         should_escalate,
         {
             "generate_briefing": "generate_briefing",
-            "answer": "answer",
+            "answer": answer_name,
         },
     )
 
@@ -102,9 +192,14 @@ def create_conversational_graph(
         },
     )
 
-    # All paths lead to contextual enhancement
-    workflow.add_edge("answer", "contextual_enhancement")
-    workflow.add_edge("approve_briefing", "contextual_enhancement")
+    # All paths lead to contextual enhancement, except approvals sent verbatim
+    if mode == "sequential":
+        workflow.add_edge("answer", "contextual_enhancement")
+    workflow.add_conditional_edges(
+        "approve_briefing",
+        needs_enhancement,
+        {"contextual_enhancement": "contextual_enhancement", END: END},
+    )
     workflow.add_edge("provide_corrections", "contextual_enhancement")
 
     # Only the briefing goes directly to END
@@ -113,4 +208,5 @@ def create_conversational_graph(
     # Final enhanced response goes to END
     workflow.add_edge("contextual_enhancement", END)
 
-    return workflow.compile()
+    # Token usage of every LLM call is recorded against the calling node
+    return workflow.compile().with_config(callbacks=[TokenUsageCallback()])
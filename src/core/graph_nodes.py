@@ -1,9 +1,50 @@
-from typing import Literal
+import asyncio
+import time
+from typing import Any, Dict, Literal, Optional, Tuple, Type
+from langchain_core.callbacks.manager import adispatch_custom_event
 from langchain_core.messages import HumanMessage, AIMessage
 from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables.config import ensure_config
 from pydantic import BaseModel, Field
-from langchain_google_genai import ChatGoogleGenerativeAI
-import asyncio
+from langchain_core.language_models import BaseChatModel
+
+from retrieval.clause_index import ClauseIndex
+from .enhancement_gate import EnhancementGate, GateDecision
+from .escalation_rules import EscalationRules
+from .history_manager import HistoryManager
+from .lawyer_feedback import extract_proposed_answer, is_plain_approval
+from .llm_scheduler import llm_scheduler
+from .metrics import (
+    LAWYER_FEEDBACK_DECISIONS,
+    ROUTING_DECISIONS,
+    SPECULATIVE_ANSWERS,
+    SPECULATIVE_WASTE,
+)
+from .single_flight import TokenFeed, llm_requests, prompt_fingerprint
+from .tokens import estimate_tokens
+
+# Tag on structured-output LLM calls, whose streamed chunks are never user text
+STRUCTURED_OUTPUT_TAG = "structured_output"
+
+# Custom event sent by the speculative router once the routing decision is
+# known, so that held back answer tokens can be streamed or dropped
+SPECULATION_RESOLVED = "speculation_resolved"
+
+# Nodes whose LLM tokens are forwarded to the user as they are generated.
+# The router and lawyer briefing are internal, and the contextual enhancement
+# rewrites the whole answer, so its text only arrives in the final frame.
+STREAMED_NODES = {"answer", "approve_briefing", "provide_corrections"}
+
+# Drafts the answer before knowing whether it will be used, so its tokens are
+# held back until the routing decision arrives
+SPECULATIVE_NODE = "speculative_router"
+
+# Custom event carrying a token of a shared LLM call to a caller that joined
+# it, and so gets no token callbacks of its own; data is {"chunk": ...}
+SHARED_TOKEN = "shared_token"
+
+# Token feeds of the shared streamed calls in flight, by event loop and key
+_token_feeds: Dict[Tuple[int, str], TokenFeed] = {}
 
 
 async def send_status_if_websocket_available(websocket, status: str):
@@ -16,6 +57,148 @@ async def send_status_if_websocket_available(websocket, status: str):
             pass
 
 
+async def invoke_llm(
+    prompt: ChatPromptTemplate,
+    llm: BaseChatModel,
+    inputs: Dict[str, Any],
+    schema: Optional[Type[BaseModel]] = None,
+    priority: str = "user",
+):
+    """
+    Renders the prompt and calls the LLM (with structured output when a
+    schema is given). Concurrent calls with an identical rendered prompt and
+    priority, e.g. several sessions asking the same question, share one
+    upstream call. In nodes whose tokens reach the user, callers that join
+    a shared call get its tokens as SHARED_TOKEN events.
+    Upstream calls are admitted by the global LLM scheduler in `priority`
+    order, within its concurrency and token budgets.
+    """
+    prompt_value = await prompt.ainvoke(inputs)
+    runnable = (
+        llm.with_structured_output(schema).with_config(tags=[STRUCTURED_OUTPUT_TAG])
+        if schema
+        else llm
+    )
+    messages = prompt_value.to_messages()
+    key = prompt_fingerprint(
+        messages,
+        type(llm).__name__,
+        getattr(llm, "model", None),
+        getattr(llm, "temperature", None),
+        schema.__name__ if schema else None,
+        # A lawyer call must not wait at the priority of a user call it joins
+        priority,
+    )
+    prompt_tokens = sum(estimate_tokens(str(message.content)) for message in messages)
+
+    if schema is None and forwards_tokens():
+        return await _invoke_streamed(key, runnable, prompt_value, priority, prompt_tokens)
+    return await llm_requests.run(
+        key,
+        lambda: llm_scheduler.run(
+            lambda: runnable.ainvoke(prompt_value), priority, prompt_tokens
+        ),
+    )
+
+
+def forwards_tokens() -> bool:
+    """Whether the calling graph node's LLM tokens are forwarded to the user."""
+    node = ensure_config().get("metadata", {}).get("langgraph_node")
+    return node in STREAMED_NODES or node == SPECULATIVE_NODE
+
+
+async def _invoke_streamed(key, runnable, prompt_value, priority, prompt_tokens):
+    """
+    invoke_llm for calls whose tokens reach the user. The caller that starts
+    the shared call streams it, so its tokens go to its own callbacks, and
+    publishes the chunks to a feed; callers that join replay the feed.
+    """
+    feed_key = (id(asyncio.get_running_loop()), key)
+    joined = _token_feeds.get(feed_key)
+    feed = TokenFeed()
+
+    def call():
+        _token_feeds[feed_key] = feed
+        task = asyncio.ensure_future(
+            llm_scheduler.run(
+                lambda: feed.collect(runnable.astream(prompt_value)),
+                priority,
+                prompt_tokens,
+                # Tokens already streamed to the user would be sent twice
+                can_retry=lambda: not feed.chunks,
+            )
+        )
+        task.add_done_callback(lambda _: _close_feed(feed_key, feed))
+        return task
+
+    if joined is None:
+        return await llm_requests.run(key, call)
+
+    relay = asyncio.ensure_future(_relay_tokens(joined))
+    try:
+        response = await llm_requests.run(key, call)
+    except BaseException:
+        relay.cancel()
+        raise
+    # The feed is closed by now, so this only sends the remaining tokens
+    await relay
+    return response
+
+
+def _close_feed(feed_key: Tuple[int, str], feed: TokenFeed):
+    feed.close()
+    # A later call for the same key may already have replaced this one
+    if _token_feeds.get(feed_key) is feed:
+        del _token_feeds[feed_key]
+
+
+async def _relay_tokens(feed: TokenFeed):
+    async for chunk in feed.replay():
+        await adispatch_custom_event(SHARED_TOKEN, {"chunk": chunk})
+
+
+def llm_priority(state: dict) -> str:
+    """Lawyer turns are scheduled ahead of user turns."""
+    return "lawyer" if state.get("lawyer_message") else "user"
+
+
+def retrieve_context_node(
+    state: dict,
+    doc_context: str,
+    clause_index: Optional[ClauseIndex] = None,
+    top_k: int = 8,
+    token_budget: int = 3000,
+):
+    """
+    Selects the contract context for this turn. With a clause index, only the
+    clauses most relevant to the query are used; otherwise the full knowledge
+    base is passed through.
+    """
+    if clause_index is None or len(clause_index) == 0:
+        return {"doc_context": doc_context}
+
+    if state.get("lawyer_message"):
+        query = f"{state.get('escalated_question') or ''} {state['lawyer_message']}"
+    else:
+        query = state.get("user_message") or ""
+
+    return {
+        "doc_context": clause_index.build_context(
+            query, top_k=top_k, token_budget=token_budget
+        )
+    }
+
+
+def history_for_prompt(
+    state: dict, history_manager: Optional[HistoryManager], purpose: str
+):
+    """The conversation history to include in a prompt for `purpose`."""
+    history = state["conversation_history"]
+    if history_manager is None:
+        return history
+    return history_manager.view(history, state.get("history_summary"), purpose)
+
+
 # Pydantic model for the router's structured output
 class RouteDecision(BaseModel):
     decision: Literal["answer_directly", "escalate_to_lawyer"] = Field(
@@ -23,6 +206,17 @@ class RouteDecision(BaseModel):
     )
 
 
+# Structured output of the combined route-and-answer call
+class RouteAndAnswer(BaseModel):
+    decision: Literal["answer_directly", "escalate_to_lawyer"] = Field(
+        description="The decision to either answer the user directly or escalate to a human lawyer."
+    )
+    answer: str = Field(
+        default="",
+        description="The answer to the user when answering directly; empty when escalating.",
+    )
+
+
 class LawyerFeedbackDecision(BaseModel):
     feedback_type: Literal["approve_briefing", "provide_corrections"] = Field(
         description="Whether the lawyer approved the briefing or provided corrections"
@@ -32,11 +226,23 @@ class LawyerFeedbackDecision(BaseModel):
     )
 
 
-def lawyer_feedback_router_node(state: dict, llm: ChatGoogleGenerativeAI):
-    """Routes lawyer feedback based on whether it's approval or corrections."""
+async def lawyer_feedback_router_node(state: dict, llm: BaseChatModel):
+    """
+    Routes lawyer feedback based on whether it's approval or corrections.
+
+    Plain approvals ("Approved, send it.") are recognised without an LLM
+    call; anything that might carry a correction is judged by the LLM.
+    """
     lawyer_message = state["lawyer_message"]
     prepared_briefing = state.get("prepared_briefing", "")
 
+    if is_plain_approval(lawyer_message):
+        print("Plain approval - skipping LLM feedback router")
+        LAWYER_FEEDBACK_DECISIONS.labels(
+            feedback_type="approve_briefing", source="rules"
+        ).inc()
+        return {"lawyer_feedback_type": "approve_briefing", "lawyer_suggestions": ""}
+
     prompt = ChatPromptTemplate.from_messages(
         [
             (
@@ -60,28 +266,52 @@ Lawyer response: {lawyer_response}""",
         ]
     )
 
-    structured_llm = llm.with_structured_output(LawyerFeedbackDecision)
-    chain = prompt | structured_llm
-
-    response = chain.invoke(
+    response = await invoke_llm(
+        prompt,
+        llm,
         {
             "briefing": prepared_briefing,
             "lawyer_response": lawyer_message,
-        }
+        },
+        schema=LawyerFeedbackDecision,
+        priority=llm_priority(state),
     )
 
+    LAWYER_FEEDBACK_DECISIONS.labels(
+        feedback_type=response.feedback_type, source="llm"
+    ).inc()
     return {
         "lawyer_feedback_type": response.feedback_type,
         "lawyer_suggestions": response.extracted_suggestions,
     }
 
 
-def approve_briefing_node(state: dict, llm: ChatGoogleGenerativeAI):
-    """Handles approved briefings by formatting the original prepared answer."""
+async def approve_briefing_node(state: dict, llm: BaseChatModel):
+    """
+    Handles approved briefings by formatting the original prepared answer.
+
+    Without lawyer comments, the "My proposed answer:" line of the briefing
+    is sent as is: it is exactly what the lawyer approved, so the turn ends
+    here without an LLM call or contextual enhancement.
+    """
     prepared_briefing = state.get("prepared_briefing", "")
     lawyer_suggestions = state.get("lawyer_suggestions", "")
     history = state["conversation_history"]
 
+    proposed_answer = (
+        None
+        if (lawyer_suggestions or "").strip()
+        else extract_proposed_answer(prepared_briefing)
+    )
+    if proposed_answer:
+        return {
+            "response_to_user": proposed_answer,
+            "conversation_history": history + [AIMessage(content=proposed_answer)],
+            "base_response": None,
+            "escalated_question": None,
+            "prepared_briefing": None,
+        }
+
     prompt = ChatPromptTemplate.from_messages(
         [
             (
@@ -109,12 +339,14 @@ Any additional lawyer comments: {suggestions}""",
         ]
     )
 
-    chain = prompt | llm
-    response = chain.invoke(
+    response = await invoke_llm(
+        prompt,
+        llm,
         {
             "briefing": prepared_briefing,
             "suggestions": lawyer_suggestions,
-        }
+        },
+        priority=llm_priority(state),
     )
 
     return {
@@ -123,11 +355,10 @@ Any additional lawyer comments: {suggestions}""",
     }
 
 
-def process_corrections_node(
-    state: dict, llm: ChatGoogleGenerativeAI, doc_context: str
-):
+async def process_corrections_node(state: dict, llm: BaseChatModel):
     """Processes lawyer corrections and synthesizes them into user response."""
     lawyer_message = state["lawyer_message"]
+    doc_context = state.get("doc_context") or ""
     lawyer_suggestions = state.get("lawyer_suggestions", "")
     escalated_question = state.get("escalated_question", "")
     history = state["conversation_history"]
@@ -173,14 +404,16 @@ Additional context: {suggestions}
         ]
     )
 
-    chain = prompt | llm
-    response = chain.invoke(
+    response = await invoke_llm(
+        prompt,
+        llm,
         {
             "question": escalated_question,
             "corrections": lawyer_message,
             "suggestions": lawyer_suggestions,
             "doc_context": doc_context,
-        }
+        },
+        priority=llm_priority(state),
     )
 
     return {
@@ -189,19 +422,25 @@ Additional context: {suggestions}
     }
 
 
-def escalation_router_node(
-    state: dict, llm: ChatGoogleGenerativeAI, escalation_rules: str
-):
-    """Decides whether to escalate to a lawyer or answer directly."""
-    user_message = state["user_message"]
-    history = state["conversation_history"]
-    websocket = state.get("websocket")
+async def escalate_on_keyword(
+    state: dict, escalation_matcher: Optional[EscalationRules]
+) -> bool:
+    """
+    Whether the user's message contains an escalation keyword, in which case
+    the turn is escalated without asking the LLM.
+    """
+    if escalation_matcher is None:
+        return False
+    keyword = escalation_matcher.match_keyword(state["user_message"])
+    if not keyword:
+        return False
+    print(f"Escalation keyword matched: '{keyword}' - skipping LLM router")
+    await send_status_if_websocket_available(state.get("websocket"), "escalation")
+    ROUTING_DECISIONS.labels(decision="escalate_to_lawyer", source="keyword").inc()
+    return True
 
-    prompt = ChatPromptTemplate.from_messages(
-        [
-            (
-                "system",
-                """You are an expert routing system for a legal AI assistant. Your task is to analyze a user's query and decide if it can be answered by the AI or if it requires escalation to a human lawyer.
+
+ROUTER_SYSTEM_PROMPT = """You are an expert routing system for a legal AI assistant. Your task is to analyze a user's query and decide if it can be answered by the AI or if it requires escalation to a human lawyer.
 
 You must follow these rules for escalation:
 {escalation_rules}
@@ -224,49 +463,61 @@ Decision: answer_directly
 Reason: Asking about contract terms for late payment, not about breach/litigation
 
 Based on the user's latest message and the conversation history, decide whether to "answer_directly" or "escalate_to_lawyer".
-""",
+"""
+
+
+async def escalation_router_node(
+    state: dict,
+    llm: BaseChatModel,
+    escalation_rules: str,
+    escalation_matcher: Optional[EscalationRules] = None,
+    history_manager: Optional[HistoryManager] = None,
+):
+    """
+    Decides whether to escalate to a lawyer or answer directly.
+
+    Queries that contain an escalation keyword are escalated immediately
+    without an LLM call; everything else is judged by the LLM router.
+    """
+    user_message = state["user_message"]
+    websocket = state.get("websocket")
+
+    if await escalate_on_keyword(state, escalation_matcher):
+        return {"decision": "escalate_to_lawyer"}
+
+    prompt = ChatPromptTemplate.from_messages(
+        [
+            (
+                "system",
+                ROUTER_SYSTEM_PROMPT,
             ),
-            *history,
+            *history_for_prompt(state, history_manager, "router"),
             ("user", "User Query: {query}"),
         ]
     )
 
-    structured_llm = llm.with_structured_output(RouteDecision)
-    chain = prompt | structured_llm
-
-    response = chain.invoke(
+    response = await invoke_llm(
+        prompt,
+        llm,
         {
             "escalation_rules": escalation_rules,
             "query": user_message,
-        }
+        },
+        schema=RouteDecision,
+        priority=llm_priority(state),
     )
 
     # Send status update based on decision
-    if websocket:
-        if response.decision == "escalate_to_lawyer":
-            asyncio.create_task(
-                send_status_if_websocket_available(websocket, "escalation")
-            )
-        else:
-            asyncio.create_task(
-                send_status_if_websocket_available(websocket, "direct_response")
-            )
+    if response.decision == "escalate_to_lawyer":
+        await send_status_if_websocket_available(websocket, "escalation")
+    else:
+        await send_status_if_websocket_available(websocket, "direct_response")
 
+    ROUTING_DECISIONS.labels(decision=response.decision, source="llm").inc()
     return {"decision": response.decision}
 
 
-def generate_direct_answer_node(
-    state: dict, llm: ChatGoogleGenerativeAI, doc_context: str
-):
-    """Generates a direct answer to the user's query."""
-    user_message = state["user_message"]
-    history = state["conversation_history"]
-
-    prompt = ChatPromptTemplate.from_messages(
-        [
-            (
-                "system",
-                """You are Lumen AI, a legal assistant. Give direct, concise answers using only the contract information provided. If you don't have sufficient information ask clarification questions before escalating the issue.
+DIRECT_ANSWER_SYSTEM_PROMPT = """You are Lumen AI, a legal assistant. Give direct, concise answers using only the contract information provided. If you don't have sufficient information ask clarification questions before escalating the issue.
 
 RESPONSE STYLE:
 - Ask clarificatory questions before launching into an answer
@@ -295,15 +546,36 @@ Example 4 - Clarification Needed:
 User: Can we (as IBM) share our co-hosting agreement with a third party vendor we need to use to deliver the services?
 Response: Is the vendor you're referring to integral to IBM's delivery of services to BlueFly Inc? If so, then section 14.6 of the co-hosting agreement permits you to do this (without prior consent from BlueFly Inc). Would you like me to check if other conditions apply (e.g. ensuring the relevant vendor complies with the co-hosting agreement)?
 Contract: {doc_context}
-""",
+"""
+
+
+async def generate_direct_answer_node(
+    state: dict,
+    llm: BaseChatModel,
+    history_manager: Optional[HistoryManager] = None,
+):
+    """Generates a direct answer to the user's query."""
+    user_message = state["user_message"]
+    doc_context = state.get("doc_context") or ""
+    history = state["conversation_history"]
+
+    prompt = ChatPromptTemplate.from_messages(
+        [
+            (
+                "system",
+                DIRECT_ANSWER_SYSTEM_PROMPT,
             ),
-            *history,
+            *history_for_prompt(state, history_manager, "answer"),
             ("user", "{query}"),
         ]
     )
 
-    chain = prompt | llm
-    response = chain.invoke({"doc_context": doc_context, "query": user_message})
+    response = await invoke_llm(
+        prompt,
+        llm,
+        {"doc_context": doc_context, "query": user_message},
+        priority=llm_priority(state),
+    )
 
     return {
         "base_response": response.content,
@@ -312,14 +584,132 @@ Contract: {doc_context}
     }
 
 
-def generate_lawyer_briefing_node(
-    state: dict, llm: ChatGoogleGenerativeAI, doc_context: str
+async def speculative_router_node(
+    state: dict,
+    llm: BaseChatModel,
+    escalation_rules: str,
+    escalation_matcher: Optional[EscalationRules] = None,
+    history_manager: Optional[HistoryManager] = None,
+):
+    """
+    Drafts the direct answer while the router decides, replacing the router
+    and answer nodes in the "speculative" graph mode, so direct answers do
+    not wait for the router first. On escalation the draft is cancelled, or
+    discarded if it already finished; both are counted as wasted work.
+    """
+    if await escalate_on_keyword(state, escalation_matcher):
+        return {"decision": "escalate_to_lawyer"}
+
+    started = time.perf_counter()
+    draft = asyncio.create_task(
+        generate_direct_answer_node(state, llm, history_manager=history_manager)
+    )
+    draft_finished = []
+    draft.add_done_callback(lambda _: draft_finished.append(time.perf_counter()))
+    try:
+        routing = await escalation_router_node(
+            state, llm, escalation_rules, history_manager=history_manager
+        )
+    except BaseException:
+        draft.cancel()
+        raise
+
+    await adispatch_custom_event(SPECULATION_RESOLVED, routing)
+    if routing["decision"] == "answer_directly":
+        SPECULATIVE_ANSWERS.labels(outcome="used").inc()
+        return {**routing, **await draft}
+
+    if draft.done():
+        SPECULATIVE_ANSWERS.labels(outcome="discarded").inc()
+        if not draft.cancelled():
+            draft.exception()  # retrieved, so a failed draft is not logged
+    else:
+        SPECULATIVE_ANSWERS.labels(outcome="cancelled").inc()
+        draft.cancel()
+    wasted_until = draft_finished[0] if draft_finished else time.perf_counter()
+    SPECULATIVE_WASTE.inc(wasted_until - started)
+    return routing
+
+
+ROUTE_AND_ANSWER_SYSTEM_PROMPT = (
+    DIRECT_ANSWER_SYSTEM_PROMPT
+    + """
+ROUTING:
+Before answering, decide whether the query can be answered by you or must go to a human lawyer. When you escalate, leave the answer empty; the legal team is briefed instead.
+
+"""
+    + ROUTER_SYSTEM_PROMPT
+)
+
+
+async def route_and_answer_node(
+    state: dict,
+    llm: BaseChatModel,
+    escalation_rules: str,
+    escalation_matcher: Optional[EscalationRules] = None,
+    history_manager: Optional[HistoryManager] = None,
 ):
+    """
+    Routes the query and drafts the direct answer in one structured LLM
+    call, replacing the router and answer nodes in the "combined" graph
+    mode. Saves a round trip on direct answers at the cost of a longer
+    prompt (and no token streaming) on every turn.
+    """
+    user_message = state["user_message"]
+    doc_context = state.get("doc_context") or ""
+    history = state["conversation_history"]
+    websocket = state.get("websocket")
+
+    if await escalate_on_keyword(state, escalation_matcher):
+        return {"decision": "escalate_to_lawyer"}
+
+    prompt = ChatPromptTemplate.from_messages(
+        [
+            ("system", ROUTE_AND_ANSWER_SYSTEM_PROMPT),
+            *history_for_prompt(state, history_manager, "answer"),
+            ("user", "User Query: {query}"),
+        ]
+    )
+
+    response = await invoke_llm(
+        prompt,
+        llm,
+        {
+            "escalation_rules": escalation_rules,
+            "doc_context": doc_context,
+            "query": user_message,
+        },
+        schema=RouteAndAnswer,
+        priority=llm_priority(state),
+    )
+
+    decision = response.decision
+    answer = response.answer.strip()
+    if decision == "answer_directly" and not answer:
+        # Better to brief the lawyer than to send the user an empty reply
+        decision = "escalate_to_lawyer"
+
+    ROUTING_DECISIONS.labels(decision=decision, source="llm").inc()
+    if decision == "escalate_to_lawyer":
+        await send_status_if_websocket_available(websocket, "escalation")
+        return {"decision": decision}
+
+    await send_status_if_websocket_available(websocket, "direct_response")
+    return {
+        "decision": decision,
+        "base_response": answer,
+        "conversation_history": history
+        + [HumanMessage(content=user_message), AIMessage(content=answer)],
+    }
+
+
+async def generate_lawyer_briefing_node(state: dict, llm: BaseChatModel):
     """
     Analyzes the user's question, finds relevant info in the knowledge base,
     and prepares a briefing for the lawyer.
     """
     user_message = state["user_message"]
+    doc_context = state.get("doc_context") or ""
     history = state["conversation_history"]
 
     prompt = ChatPromptTemplate.from_messages(
@@ -361,8 +751,14 @@ Contract: {doc_context}
         ]
     )
 
-    chain = prompt | llm
-    briefing = chain.invoke({"doc_context": doc_context, "query": user_message}).content
+    briefing = (
+        await invoke_llm(
+            prompt,
+            llm,
+            {"doc_context": doc_context, "query": user_message},
+            priority=llm_priority(state),
+        )
+    ).content
 
     response_for_user = "Checking with legal counsel on this one."
 
@@ -379,14 +775,109 @@ Contract: {doc_context}
     }
 
 
-def contextual_enhancement_node(
-    state: dict, llm: ChatGoogleGenerativeAI, doc_context: str
+ENHANCEMENT_NOT_NEEDED = "NO_ENHANCEMENT_NEEDED"
+
+
+async def enhance_response(
+    llm: BaseChatModel,
+    user_message: str,
+    base_response: str,
+    doc_context: str,
+    priority: str = "user",
+    gate_decision: Optional[GateDecision] = None,
+) -> Optional[str]:
+    """
+    Asks the LLM for a version of `base_response` with one relevant factual
+    detail added. Returns None if it found nothing worth adding. The result
+    is logged against the enhancement gate's prediction, if given.
+    """
+    prompt = ChatPromptTemplate.from_messages(
+        [
+            (
+                "system",
+                """You are a legal AI assistant providing contextual enhancement to contract-related responses. Your role is to add only simple, factual contract details that are directly relevant to the user's question.
+
+CRITICAL RESPONSIBILITIES:
+- Only add straightforward contractual facts (dates, amounts, deadlines, basic obligations)
+- DO NOT add anything requiring legal interpretation, judgment, or analysis
+- DO NOT add information about complex legal concepts, liability, indemnification, or dispute resolution
+- If the enhancement would require legal expertise to interpret, respond with "NO_ENHANCEMENT_NEEDED"
+- Focus only on operational details the user should know
+
+ENHANCEMENT RULES:
+- Only enhance if there's something genuinely important they should know
+- Add context naturally to the existing response
+- Keep additions brief - one short sentence max
+- Focus on deadlines, payment amounts, notice periods, or basic procedural requirements
+- If nothing important to add, respond with exactly: "NO_ENHANCEMENT_NEEDED"
+
+EXAMPLES:
+
+Example 1 - Safe Enhancement:
+User Query: "When do we need to pay IBM for hosting services?"
+Base Response: "Payment is due upon receipt of invoice (Section 4.2)."
+Enhanced Response: "Payment is due upon receipt of invoice (Section 4.2). Note that late payments incur fees as specified in the invoice terms."
+
+Example 2 - No Enhancement (too complex):
+User Query: "What are our liability limits?"
+Base Response: "Direct damages are capped at $15 million (Section 10)."
+Enhanced Response: "NO_ENHANCEMENT_NEEDED"
+
+Example 3 - Safe Enhancement:
+User Query: "What's the notice period for termination?"
+Base Response: "30 days written notice is required (Section 3.4)."
+Enhanced Response: "30 days written notice is required (Section 3.4), and notice must be sent to the address specified in Section 12.1."
+""",
+            ),
+            (
+                "user",
+                """User asked: {user_message}
+
+Current response: {base_response}
+
+Contract details: {doc_context}
+
+Enhance the response with one relevant factual detail if beneficial, otherwise respond "NO_ENHANCEMENT_NEEDED".""",
+            ),
+        ]
+    )
+
+    response = await invoke_llm(
+        prompt,
+        llm,
+        {
+            "user_message": user_message,
+            "base_response": base_response,
+            "doc_context": doc_context,
+        },
+        priority=priority,
+    )
+
+    # Check if enhancement was deemed necessary
+    enhanced = (
+        None if response.content.strip() == ENHANCEMENT_NOT_NEEDED else response.content
+    )
+    if gate_decision is not None:
+        gate_decision.record(enhanced)
+    return enhanced
+
+
+async def contextual_enhancement_node(
+    state: dict,
+    llm: BaseChatModel,
+    defer: bool = False,
+    gate: Optional[EnhancementGate] = None,
 ):
     """
     Analyzes the base response and user query to potentially enhance the response
     with relevant contextual information from the contract.
+
+    With `defer`, the base response is returned as the answer straight away
+    and the inputs for the enhancement are left in `enhancement_request`.
+    The enhancement gate, if given, may skip the enhancement altogether.
     """
     base_response = state.get("base_response")
+    doc_context = state.get("doc_context")
     user_message = state.get("user_message") or state.get("escalated_question")
     history = state["conversation_history"]
     websocket = state.get("websocket")
@@ -433,81 +924,50 @@ def contextual_enhancement_node(
             "prepared_briefing": None,
         }
 
-    # Send status update
-    if websocket:
-        asyncio.create_task(
-            send_status_if_websocket_available(websocket, "contextual_analysis")
-        )
-
-    try:
-        prompt = ChatPromptTemplate.from_messages(
-            [
-                (
-                    "system",
-                    """You are a legal AI assistant providing contextual enhancement to contract-related responses. Your role is to add only simple, factual contract details that are directly relevant to the user's question.
-
-CRITICAL RESPONSIBILITIES:
-- Only add straightforward contractual facts (dates, amounts, deadlines, basic obligations)
-- DO NOT add anything requiring legal interpretation, judgment, or analysis
-- DO NOT add information about complex legal concepts, liability, indemnification, or dispute resolution
-- If the enhancement would require legal expertise to interpret, respond with "NO_ENHANCEMENT_NEEDED"
-- Focus only on operational details the user should know
-
-ENHANCEMENT RULES:
-- Only enhance if there's something genuinely important they should know
-- Add context naturally to the existing response
-- Keep additions brief - one short sentence max
-- Focus on deadlines, payment amounts, notice periods, or basic procedural requirements
-- If nothing important to add, respond with exactly: "NO_ENHANCEMENT_NEEDED"
-
-EXAMPLES:
-
-Example 1 - Safe Enhancement:
-User Query: "When do we need to pay IBM for hosting services?"
-Base Response: "Payment is due upon receipt of invoice (Section 4.2)."
-Enhanced Response: "Payment is due upon receipt of invoice (Section 4.2). Note that late payments incur fees as specified in the invoice terms."
-
-Example 2 - No Enhancement (too complex):
-User Query: "What are our liability limits?"
-Base Response: "Direct damages are capped at $15 million (Section 10)."
-Enhanced Response: "NO_ENHANCEMENT_NEEDED"
-
-Example 3 - Safe Enhancement:
-User Query: "What's the notice period for termination?"
-Base Response: "30 days written notice is required (Section 3.4)."
-Enhanced Response: "30 days written notice is required (Section 3.4), and notice must be sent to the address specified in Section 12.1."
-""",
-                ),
-                (
-                    "user",
-                    """User asked: {user_message}
-
-Current response: {base_response}
-
-Contract details: {doc_context}
-
-Enhance the response with one relevant factual detail if beneficial, otherwise respond "NO_ENHANCEMENT_NEEDED".""",
-                ),
-            ]
-        )
+    gate_decision = (
+        gate.predict(user_message, base_response, doc_context) if gate else None
+    )
+    if gate is not None and gate.skips(gate_decision):
+        return {
+            "response_to_user": base_response,
+            "conversation_history": history,
+            "base_response": None,
+            "escalated_question": None,
+            "prepared_briefing": None,
+        }
 
-        chain = prompt | llm
-        response = chain.invoke(
-            {
+    if defer:
+        # Progressive delivery: the base response is sent right away and the
+        # endpoint runs the enhancement in the background
+        return {
+            "response_to_user": base_response,
+            "conversation_history": history,
+            "base_response": None,
+            "escalated_question": None,
+            "prepared_briefing": None,
+            "enhancement_request": {
                 "user_message": user_message,
                 "base_response": base_response,
                 "doc_context": doc_context,
-            }
-        )
+                "gate_decision": gate_decision,
+            },
+        }
 
-        # Check if enhancement was deemed necessary
-        if response.content.strip() == "NO_ENHANCEMENT_NEEDED":
-            final_response = base_response
-        else:
-            final_response = response.content
+    # Send status update
+    await send_status_if_websocket_available(websocket, "contextual_analysis")
+
+    try:
+        enhanced = await enhance_response(
+            llm,
+            user_message,
+            base_response,
+            doc_context,
+            llm_priority(state),
+            gate_decision=gate_decision,
+        )
 
         return {
-            "response_to_user": final_response,
+            "response_to_user": enhanced or base_response,
             "conversation_history": history,
             "base_response": None,
             "escalated_question": None,
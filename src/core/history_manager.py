@@ -0,0 +1,174 @@
+from typing import List, Optional, Tuple
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
+from langchain_core.prompts import ChatPromptTemplate
+
+from .llm_scheduler import llm_scheduler
+from .tokens import estimate_tokens
+
+
+def split_turns(history: List[BaseMessage]) -> List[List[BaseMessage]]:
+    """Groups messages into turns, each starting at a user message."""
+    turns: List[List[BaseMessage]] = []
+    for message in history:
+        if isinstance(message, HumanMessage) or not turns:
+            turns.append([message])
+        else:
+            turns[-1].append(message)
+    return turns
+
+
+def _turn_tokens(turn: List[BaseMessage]) -> int:
+    return sum(estimate_tokens(str(message.content)) for message in turn)
+
+
+class HistoryManager:
+    """
+    Keeps the conversation history sent to the LLM bounded.
+
+    Older turns are folded into a running summary by `compact()` in batches:
+    once more than `keep_last_turns + compact_batch_turns - 1` turns have
+    built up (or they outgrow `max_history_tokens`), the history is compacted
+    down to the last `keep_last_turns`, leaving token room for the next
+    batch, so a summary call is made every `compact_batch_turns` turns (or as
+    many as fit, when long answers make tokens the limit) rather than on
+    every turn. Prompts get the
+    turns not yet folded verbatim, within `max_history_tokens`. The router
+    only sees the last `router_turns` turns, since it just needs enough
+    context to resolve follow-up questions.
+    """
+
+    def __init__(
+        self,
+        keep_last_turns: int = 6,
+        router_turns: int = 2,
+        max_history_tokens: int = 2000,
+        summary_max_tokens: int = 300,
+        compact_batch_turns: int = 4,
+    ):
+        self.keep_last_turns = max(1, keep_last_turns)
+        self.router_turns = router_turns
+        self.max_history_tokens = max_history_tokens
+        self.summary_max_tokens = summary_max_tokens
+        self.compact_batch_turns = max(1, compact_batch_turns)
+
+    @property
+    def max_verbatim_turns(self) -> int:
+        """The most turns held verbatim between compactions."""
+        return self.keep_last_turns + self.compact_batch_turns - 1
+
+    def _kept_tokens(self, turns: List[List[BaseMessage]]) -> int:
+        """
+        Token limit of the turns a compaction keeps: the history token limit
+        less room for `compact_batch_turns` turns of the average length so
+        far, so long answers do not bring on a compaction every turn.
+        """
+        average = sum(_turn_tokens(turn) for turn in turns) / len(turns)
+        return self.max_history_tokens - int(average * self.compact_batch_turns)
+
+    def _recent_turns(
+        self,
+        turns: List[List[BaseMessage]],
+        limit: int,
+        max_tokens: Optional[int] = None,
+    ) -> List[List[BaseMessage]]:
+        """
+        The most recent `limit` turns within `max_tokens` (by default the
+        history token limit); always at least one.
+        """
+        if max_tokens is None:
+            max_tokens = self.max_history_tokens
+        kept: List[List[BaseMessage]] = []
+        used_tokens = 0
+        for turn in reversed(turns[-limit:]):
+            cost = _turn_tokens(turn)
+            if kept and used_tokens + cost > max_tokens:
+                break
+            kept.insert(0, turn)
+            used_tokens += cost
+        return kept
+
+    def view(
+        self,
+        history: List[BaseMessage],
+        summary: Optional[str] = None,
+        purpose: str = "answer",
+    ) -> List[BaseMessage]:
+        """The history to put in a prompt for `purpose` ("router" or "answer")."""
+        turns = split_turns(history)
+        if purpose == "router":
+            recent = turns[-self.router_turns :] if self.router_turns > 0 else []
+            return [message for turn in recent for message in turn]
+
+        recent = self._recent_turns(turns, self.max_verbatim_turns)
+        messages = [message for turn in recent for message in turn]
+        if summary:
+            messages.insert(
+                0, SystemMessage(content=f"Summary of the earlier conversation: {summary}")
+            )
+        return messages
+
+    def needs_compaction(self, history: List[BaseMessage]) -> bool:
+        """Whether the history holds turns that prompts no longer include."""
+        turns = split_turns(history)
+        return len(self._recent_turns(turns, self.max_verbatim_turns)) < len(turns)
+
+    async def compact(
+        self,
+        history: List[BaseMessage],
+        summary: Optional[str],
+        llm: BaseChatModel,
+    ) -> Tuple[List[BaseMessage], Optional[str]]:
+        """
+        Once the history needs compaction, folds all but the last
+        `keep_last_turns` turns into the summary, keeping them within the
+        token limit less room for the next batch of turns.
+        Returns the (possibly shortened) history and the updated summary.
+        """
+        if not self.needs_compaction(history):
+            return history, summary
+        turns = split_turns(history)
+        kept = self._recent_turns(
+            turns, self.keep_last_turns, self._kept_tokens(turns)
+        )
+        folded = turns[: len(turns) - len(kept)]
+
+        transcript = "\n".join(
+            f"{'User' if isinstance(message, HumanMessage) else 'Lumen AI'}: {message.content}"
+            for turn in folded
+            for message in turn
+        )
+        prompt = ChatPromptTemplate.from_messages(
+            [
+                (
+                    "system",
+                    """You maintain a running summary of a conversation between a user and Lumen AI, a legal assistant answering questions about contracts.
+
+Update the summary with the new conversation turns. Keep the questions asked, the facts and clause references given in answers, and anything escalated to or decided by the legal team. Drop greetings and filler. Write plain prose of at most {max_words} words.""",
+                ),
+                (
+                    "user",
+                    """Current summary: {summary}
+
+New conversation turns:
+{transcript}""",
+                ),
+            ]
+        )
+
+        prompt_value = await prompt.ainvoke(
+            {
+                "summary": summary or "(none yet)",
+                "transcript": transcript,
+                # Roughly 0.75 words per token
+                "max_words": int(self.summary_max_tokens * 0.75),
+            }
+        )
+        # Summaries are housekeeping, so they queue behind user and lawyer turns
+        response = await llm_scheduler.run(
+            lambda: llm.ainvoke(prompt_value),
+            priority="background",
+            prompt_tokens=estimate_tokens(prompt_value.to_string()),
+        )
+        return [message for turn in kept for message in turn], response.content.strip()
@@ -0,0 +1,103 @@
+import re
+from typing import Optional
+
+# Phrases that approve a briefing as it stands
+APPROVAL_PHRASES = [
+    "approved",
+    "approve",
+    "lgtm",
+    "looks good",
+    "looks fine",
+    "looks right",
+    "all good",
+    "good to go",
+    "send it",
+    "send it out",
+    "go ahead",
+    "ok",
+    "okay",
+    "yes",
+    "yep",
+    "yeah",
+    "is correct",
+    "that's correct",
+    "thats correct",
+    "is right",
+    "that's right",
+    "fine",
+    "agreed",
+    "agree",
+    "perfect",
+    "great",
+    "this works",
+    "that works",
+    "sounds good",
+    "confirmed",
+]
+
+# Words that may accompany an approval without qualifying it ("yes, I
+# approve this answer, thanks"). Anything else, such as "but", "not" or
+# "mention", makes the reply ambiguous and it is left to the LLM.
+FILLER_WORDS = {
+    "i",
+    "we",
+    "it",
+    "this",
+    "that",
+    "is",
+    "the",
+    "answer",
+    "proposed",
+    "briefing",
+    "response",
+    "please",
+    "thanks",
+    "thank",
+    "you",
+    "by",
+    "me",
+    "as",
+    "all",
+    "fully",
+}
+
+# Longer replies are unlikely to be plain approvals
+MAX_APPROVAL_WORDS = 12
+
+_WORD = re.compile(r"[a-z0-9']+")
+
+_APPROVAL = re.compile(
+    r"\b(?:"
+    + "|".join(re.escape(phrase) for phrase in sorted(APPROVAL_PHRASES, key=len, reverse=True))
+    + r")\b"
+)
+
+# The "My proposed answer:" line of the briefing format enforced by
+# generate_lawyer_briefing_node, tolerating markdown emphasis
+_PROPOSED_ANSWER = re.compile(
+    r"my proposed answer[*_\s]*:[*_\s]*(.+)", re.IGNORECASE
+)
+_CLOSING_QUESTION = re.compile(r"\s*\bis this (?:okay|ok|correct|alright)\b\??", re.IGNORECASE)
+
+
+def is_plain_approval(message: Optional[str]) -> bool:
+    """
+    Whether a lawyer's reply is an unambiguous approval with no corrections
+    or comments ("Approved, send it.", "Looks good, thanks"), so it can be
+    handled without an LLM call. Returns False whenever in doubt.
+    """
+    words = _WORD.findall((message or "").lower().replace("’", "'"))
+    if not words or len(words) > MAX_APPROVAL_WORDS:
+        return False
+    remainder, approvals = _APPROVAL.subn(" ", " ".join(words))
+    return approvals > 0 and all(word in FILLER_WORDS for word in remainder.split())
+
+
+def extract_proposed_answer(briefing: Optional[str]) -> Optional[str]:
+    """The proposed answer from a lawyer briefing, or None if it has none."""
+    match = _PROPOSED_ANSWER.search(briefing or "")
+    if not match:
+        return None
+    answer = _CLOSING_QUESTION.split(match.group(1))[0]
+    answer = answer.strip().strip("\"“”[]*_").strip()
+    return answer or None
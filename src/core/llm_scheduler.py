@@ -0,0 +1,188 @@
+import asyncio
+import heapq
+import itertools
+import random
+import time
+from typing import Any, Awaitable, Callable, List, Optional
+
+from .metrics import LLM_ACTIVE, LLM_QUEUE_DEPTH, LLM_QUEUE_WAIT, LLM_RETRIES
+
+# Lower runs first: a lawyer waiting on a reply goes ahead of new user
+# questions, and housekeeping such as history summaries goes last.
+PRIORITIES = {"lawyer": 0, "user": 1, "background": 2}
+
+
+def retryable_status(error: BaseException) -> Optional[int]:
+    """
+    The HTTP status of a rate limit (429) or server error (5xx) behind
+    `error`, or None if retrying would not help. Provider SDKs expose the
+    status as `code` or `status_code`, possibly on a wrapped exception.
+    """
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        for attribute in ("status_code", "code"):
+            status = getattr(error, attribute, None)
+            if isinstance(status, int) and (status == 429 or 500 <= status < 600):
+                return status
+        error = error.__cause__ or error.__context__
+    return None
+
+
+class LLMScheduler:
+    """
+    Admits LLM calls in priority order within a concurrency limit and an
+    optional tokens-per-minute budget, and retries rate-limited or failed
+    calls with jittered exponential backoff.
+
+    The token budget is a bucket refilled continuously at
+    `tokens_per_minute / 60` per second. Each call is charged its estimated
+    prompt plus completion tokens up front, corrected to the actual usage
+    when the response reports it.
+    """
+
+    def __init__(self, **settings):
+        self._active = 0
+        # (priority, sequence, tokens, enqueued_at, future); FIFO within a priority
+        self._waiters: List[tuple] = []
+        self._sequence = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._timer_loop: Optional[asyncio.AbstractEventLoop] = None
+        self.configure(**settings)
+
+    def configure(
+        self,
+        max_concurrency: int = 8,
+        tokens_per_minute: Optional[int] = None,
+        max_retries: int = 4,
+        base_delay_seconds: float = 1.0,
+        max_delay_seconds: float = 30.0,
+        completion_tokens_estimate: int = 300,
+    ):
+        self.max_concurrency = max(1, max_concurrency)
+        self.tokens_per_minute = tokens_per_minute
+        self.max_retries = max_retries
+        self.base_delay_seconds = base_delay_seconds
+        self.max_delay_seconds = max_delay_seconds
+        self.completion_tokens_estimate = completion_tokens_estimate
+        self._available_tokens = float(tokens_per_minute or 0)
+        self._refilled_at = time.monotonic()
+
+    async def run(
+        self,
+        call: Callable[[], Awaitable[Any]],
+        priority: str = "user",
+        prompt_tokens: int = 0,
+        can_retry: Optional[Callable[[], bool]] = None,
+    ) -> Any:
+        """
+        Runs `call()` once admitted, retrying on 429/5xx errors. A failed call
+        is not retried when `can_retry()` is false, e.g. once streamed tokens
+        have reached the user: a retry would send them again.
+        """
+        tokens = prompt_tokens + self.completion_tokens_estimate
+        for attempt in range(self.max_retries + 1):
+            await self._acquire(priority, tokens)
+            try:
+                result = await call()
+            except Exception as e:
+                status = retryable_status(e)
+                if (
+                    status is None
+                    or attempt == self.max_retries
+                    or (can_retry is not None and not can_retry())
+                ):
+                    raise
+            else:
+                self._reconcile(tokens, result)
+                return result
+            finally:
+                self._release()
+
+            # Full jitter keeps retrying callers from hitting the provider in step
+            delay = random.uniform(
+                0, min(self.max_delay_seconds, self.base_delay_seconds * 2**attempt)
+            )
+            LLM_RETRIES.labels(status=str(status)).inc()
+            print(f"⚠️ LLM call failed with {status}, retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+    async def _acquire(self, priority: str, tokens: int):
+        future = asyncio.get_running_loop().create_future()
+        entry = (PRIORITIES[priority], next(self._sequence), tokens, time.monotonic(), future)
+        heapq.heappush(self._waiters, entry)
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Admitted just as the caller was cancelled; hand the slot back
+                self._release()
+            elif entry in self._waiters:
+                self._waiters.remove(entry)
+                heapq.heapify(self._waiters)
+                self._record_queue()
+            raise
+        LLM_QUEUE_WAIT.labels(priority=priority).observe(time.monotonic() - entry[3])
+
+    def _release(self):
+        self._active -= 1
+        self._dispatch()
+
+    def _refill(self):
+        now = time.monotonic()
+        if self.tokens_per_minute:
+            self._available_tokens = min(
+                self.tokens_per_minute,
+                self._available_tokens
+                + (now - self._refilled_at) * self.tokens_per_minute / 60,
+            )
+        self._refilled_at = now
+
+    def _dispatch(self):
+        """Admits waiters, highest priority first, while slots and tokens allow."""
+        self._refill()
+        while self._waiters and self._active < self.max_concurrency:
+            _, _, tokens, _, future = self._waiters[0]
+            if future.done():
+                # Cancelled while queued
+                heapq.heappop(self._waiters)
+                continue
+            if self.tokens_per_minute:
+                # A call larger than the whole budget waits for a full bucket
+                needed = min(tokens, self.tokens_per_minute)
+                if self._available_tokens < needed:
+                    shortfall = needed - self._available_tokens
+                    self._dispatch_later(shortfall * 60 / self.tokens_per_minute)
+                    break
+                self._available_tokens -= tokens
+            heapq.heappop(self._waiters)
+            self._active += 1
+            future.set_result(None)
+        self._record_queue()
+
+    def _dispatch_later(self, delay: float):
+        loop = asyncio.get_running_loop()
+        if self._timer is not None and self._timer_loop is loop:
+            self._timer.cancel()
+        self._timer = loop.call_later(delay, self._dispatch)
+        self._timer_loop = loop
+
+    def _reconcile(self, estimated_tokens: int, result: Any):
+        """Corrects the token charge to the usage the provider reported."""
+        usage = getattr(result, "usage_metadata", None)
+        if self.tokens_per_minute and usage:
+            self._available_tokens += estimated_tokens - usage.get("total_tokens", 0)
+
+    def _record_queue(self):
+        depths = {name: 0 for name in PRIORITIES}
+        names = {rank: name for name, rank in PRIORITIES.items()}
+        for rank, *_ in self._waiters:
+            depths[names[rank]] += 1
+        for name, depth in depths.items():
+            LLM_QUEUE_DEPTH.labels(priority=name).set(depth)
+        LLM_ACTIVE.set(self._active)
+
+
+# Shared by every graph in the process; configured from config.yaml at startup
+llm_scheduler = LLMScheduler()
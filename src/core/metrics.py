@@ -0,0 +1,188 @@
+import inspect
+import time
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+from prometheus_client import Counter, Gauge, Histogram
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2, 4, 8, 16, 32)
+TOKEN_BUCKETS = (16, 64, 128, 256, 512, 1024, 2048, 4096, 8192, 16384, 32768)
+
+NODE_DURATION = Histogram(
+    "lumen_node_duration_seconds",
+    "Wall-clock time spent in each graph node, by the turn's routing decision "
+    "(lawyer feedback type on lawyer turns; undecided before routing)",
+    ["node", "decision"],
+    buckets=LATENCY_BUCKETS,
+)
+NODE_ERRORS = Counter(
+    "lumen_node_errors_total",
+    "Exceptions raised by graph nodes",
+    ["node"],
+)
+LLM_PROMPT_TOKENS = Histogram(
+    "lumen_llm_prompt_tokens",
+    "Prompt tokens per LLM call, by the graph node that made it",
+    ["node"],
+    buckets=TOKEN_BUCKETS,
+)
+LLM_COMPLETION_TOKENS = Histogram(
+    "lumen_llm_completion_tokens",
+    "Completion tokens per LLM call, by the graph node that made it",
+    ["node"],
+    buckets=TOKEN_BUCKETS,
+)
+LLM_ERRORS = Counter(
+    "lumen_llm_errors_total",
+    "Failed LLM calls, by the graph node that made them",
+    ["node"],
+)
+LLM_REQUESTS = Counter(
+    "lumen_llm_requests_total",
+    "LLM calls from graph nodes, sent upstream or coalesced with an identical call in flight",
+    ["result"],
+)
+LLM_QUEUE_DEPTH = Gauge(
+    "lumen_llm_queue_depth",
+    "LLM calls waiting for the scheduler to admit them, by priority class",
+    ["priority"],
+)
+LLM_ACTIVE = Gauge(
+    "lumen_llm_active_requests",
+    "LLM calls currently admitted by the scheduler",
+)
+LLM_QUEUE_WAIT = Histogram(
+    "lumen_llm_queue_wait_seconds",
+    "Time LLM calls spent queued before being admitted, by priority class",
+    ["priority"],
+    buckets=LATENCY_BUCKETS,
+)
+LLM_RETRIES = Counter(
+    "lumen_llm_retries_total",
+    "LLM calls retried after a rate limit or server error, by HTTP status",
+    ["status"],
+)
+ROUTING_DECISIONS = Counter(
+    "lumen_routing_decisions_total",
+    "Router decisions, by how they were made (keyword pre-router or LLM)",
+    ["decision", "source"],
+)
+LAWYER_FEEDBACK_DECISIONS = Counter(
+    "lumen_lawyer_feedback_decisions_total",
+    "Lawyer feedback classifications, by how they were made (rules or LLM)",
+    ["feedback_type", "source"],
+)
+ENHANCEMENT_GATE = Counter(
+    "lumen_enhancement_gate_total",
+    "Enhancement gate predictions by query category, against the LLM's result "
+    "(or skipped, when the gate saved the call)",
+    ["category", "prediction", "llm_result"],
+)
+SPECULATIVE_ANSWERS = Counter(
+    "lumen_speculative_answers_total",
+    "Answers drafted alongside the router in speculative mode: used, or thrown "
+    "away on escalation (cancelled mid-call or discarded once complete)",
+    ["outcome"],
+)
+SPECULATIVE_WASTE = Counter(
+    "lumen_speculative_wasted_seconds_total",
+    "Time speculative answers had been running when they were thrown away",
+)
+TURN_DURATION = Histogram(
+    "lumen_turn_duration_seconds",
+    "End-to-end graph time per conversational turn, by the path it took",
+    ["message_type", "decision"],
+    buckets=LATENCY_BUCKETS,
+)
+SESSION_STORE = Gauge(
+    "lumen_session_store",
+    "Session store occupancy, hit and eviction counters",
+    ["stat"],
+)
+ANSWER_CACHE = Gauge(
+    "lumen_answer_cache",
+    "Answer cache occupancy, hits (exact / near-duplicate), misses and evictions",
+    ["stat"],
+)
+
+
+def turn_decision(state: dict, result: Any = None) -> str:
+    """
+    The turn's routing decision as far as it is known once a node has run:
+    the router's decision, or the lawyer feedback type on lawyer turns.
+    """
+    key = "lawyer_feedback_type" if state.get("lawyer_message") else "decision"
+    decision = result.get(key) if isinstance(result, dict) else None
+    return decision or state.get(key) or "undecided"
+
+
+def instrument_node(name: str, node):
+    """Wraps a graph node (sync or async) so its latency and errors are recorded."""
+
+    async def instrumented(state: dict):
+        started = time.perf_counter()
+        result = None
+        try:
+            result = node(state)
+            if inspect.isawaitable(result):
+                result = await result
+            return result
+        except Exception:
+            NODE_ERRORS.labels(node=name).inc()
+            raise
+        finally:
+            NODE_DURATION.labels(node=name, decision=turn_decision(state, result)).observe(
+                time.perf_counter() - started
+            )
+
+    return instrumented
+
+
+class TokenUsageCallback(BaseCallbackHandler):
+    """
+    Records prompt/completion token counts of every chat model call made
+    inside the graph, attributed to the node that made the call.
+    """
+
+    def __init__(self):
+        self._run_nodes: Dict[UUID, str] = {}
+
+    def on_chat_model_start(
+        self,
+        serialized: Dict[str, Any],
+        messages: Any,
+        *,
+        run_id: UUID,
+        metadata: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> None:
+        self._run_nodes[run_id] = (metadata or {}).get("langgraph_node", "unknown")
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        node = self._run_nodes.pop(run_id, "unknown")
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+                if usage:
+                    LLM_PROMPT_TOKENS.labels(node=node).observe(usage.get("input_tokens", 0))
+                    LLM_COMPLETION_TOKENS.labels(node=node).observe(
+                        usage.get("output_tokens", 0)
+                    )
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        LLM_ERRORS.labels(node=self._run_nodes.pop(run_id, "unknown")).inc()
+
+
+def record_session_store_stats(stats: Dict[str, Any]) -> None:
+    """Copies a SessionStore's stats() into gauges; called on each scrape."""
+    for key, value in stats.items():
+        if isinstance(value, (int, float)):
+            SESSION_STORE.labels(stat=key).set(value)
+
+
+def record_answer_cache_stats(stats: Dict[str, Any]) -> None:
+    """Copies the AnswerCache's stats() into gauges; called on each scrape."""
+    for key, value in stats.items():
+        ANSWER_CACHE.labels(stat=key).set(value)
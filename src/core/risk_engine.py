@@ -0,0 +1,267 @@
+import json
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+WORD_NUMBERS = {
+    "one": 1,
+    "two": 2,
+    "twice": 2,
+    "three": 3,
+    "four": 4,
+    "five": 5,
+    "six": 6,
+    "seven": 7,
+    "eight": 8,
+    "nine": 9,
+    "ten": 10,
+}
+
+UNIT_DAYS = {"day": 1, "week": 7, "month": 30, "year": 365}
+
+US_STATES = {
+    "alabama", "alaska", "arizona", "arkansas", "california", "colorado",
+    "connecticut", "delaware", "florida", "georgia", "hawaii", "idaho",
+    "illinois", "indiana", "iowa", "kansas", "kentucky", "louisiana", "maine",
+    "maryland", "massachusetts", "michigan", "minnesota", "mississippi",
+    "missouri", "montana", "nebraska", "nevada", "new hampshire", "new jersey",
+    "new mexico", "new york", "north carolina", "north dakota", "ohio",
+    "oklahoma", "oregon", "pennsylvania", "rhode island", "south carolina",
+    "south dakota", "tennessee", "texas", "utah", "vermont", "virginia",
+    "washington", "west virginia", "wisconsin", "wyoming",
+    "district of columbia", "united states",
+}
+
+# "thirty (30) days' prior written notice", "thirty-day (30-day) written
+# notice", "notice of at least 90 days". Cure periods ("within ten (10)
+# days after written notice") are not notice periods and do not match.
+NOTICE_PERIOD = re.compile(
+    r"\b(\d+)\)?[\s-]*(?:business\s+|calendar\s+|working\s+)?(day|week|month|year)s?['’]?\)?"
+    r"\s+(?:(?:prior|advance|advanced|written|of)\s+)*notice\b"
+    r"|\bnotice\s+of\s+(?:at\s+least\s+|not\s+less\s+than\s+)?(?:[a-z-]+\s+)?\(?(\d+)\)?\s*"
+    r"(?:business\s+|calendar\s+|working\s+)?(day|week|month|year)s?\b",
+    re.IGNORECASE,
+)
+
+# "governed by the laws of the State of New York", "construed under the
+# laws of England and Wales"
+GOVERNING_LAW = re.compile(
+    r"(?i:\b(?:governed|construed|interpreted|enforced)\b[^.;]{0,80}?\blaws?\s+of\s+"
+    r"(?:the\s+)?(?:state\s+of\s+|commonwealth\s+of\s+)?)"
+    r"([A-Z][A-Za-z]+(?:\s+(?:of\s+|and\s+)?[A-Z][A-Za-z]+)*)"
+)
+
+UNLIMITED_LIABILITY = re.compile(
+    r"\bunlimited\s+liability\b"
+    r"|\bliability\b[^.;]{0,40}?\b(?:shall|will)\s+"
+    r"(?:not\s+be\s+(?:limited|capped)\b(?!\s+to)|be\s+unlimited)"
+    r"|\bno\s+(?:limitation|limit|cap)\s+(?:of|on)\s+(?:the\s+)?(?:\w+\s+)?liability\b",
+    re.IGNORECASE,
+)
+# "capped at 2 times the fees", "three (3) times the annual fees",
+# "twice the amounts paid", "1.5x the contract value"
+LIABILITY_MULTIPLIER = re.compile(
+    r"\b(?:(\d+(?:\.\d+)?)\s*(?:x|times)|(one|two|three|four|five|six|seven|eight|nine|ten)"
+    r"(?:\s+\((\d+(?:\.\d+)?)\))?\s+times|(twice))\s+(?:the\s+)?(?:total\s+|annual\s+|aggregate\s+)*"
+    r"(?:fees|amounts?|contract\s+(?:value|price)|charges|consideration|sums)\b",
+    re.IGNORECASE,
+)
+
+
+# Sentences start after a full stop or semicolon and end at a full stop,
+# but only one followed by whitespace or the end of the text, so clause
+# numbers and decimals ("Section 12.3", "1.5x") do not split a sentence
+SENTENCE_END = re.compile(r"\.(?=\s|$)")
+
+
+def _sentence_start(text: str, position: int) -> int:
+    start = position
+    while True:
+        start = max(text.rfind(".", 0, start), text.rfind(";", 0, start))
+        if start == -1 or start + 1 == len(text) or text[start + 1].isspace():
+            return start + 1
+
+
+def _sentences(text: str, keyword: str) -> Iterator[str]:
+    """
+    Yields each sentence of the text that contains the (lowercase) keyword.
+    The patterns only run on these sentences: a plain substring search
+    over a long contract is much faster than running every pattern on it.
+    """
+    lowered = text.lower()
+    position = lowered.find(keyword)
+    while position != -1:
+        start = _sentence_start(text, position)
+        match = SENTENCE_END.search(text, position)
+        end = match.end() if match else len(text)
+        yield text[start:end]
+        position = lowered.find(keyword, end)
+
+
+def notice_periods(text: str) -> List[int]:
+    """Termination notice periods in the text, in days."""
+    periods = []
+    for sentence in _sentences(text, "terminat"):
+        for match in NOTICE_PERIOD.finditer(sentence):
+            count, unit = match.group(1, 2) if match.group(1) else match.group(3, 4)
+            periods.append(int(count) * UNIT_DAYS[unit.lower()])
+    return periods
+
+
+def jurisdictions(text: str) -> List[str]:
+    """Governing law jurisdictions named in the text, in order of appearance."""
+    found = []
+    for sentence in _sentences(text, "law"):
+        for match in GOVERNING_LAW.finditer(sentence):
+            jurisdiction = match.group(1).strip()
+            if jurisdiction not in found:
+                found.append(jurisdiction)
+    return found
+
+
+def has_unlimited_liability(text: str) -> bool:
+    return any(
+        UNLIMITED_LIABILITY.search(sentence) for sentence in _sentences(text, "liab")
+    )
+
+
+def liability_multipliers(text: str) -> List[float]:
+    """Liability caps expressed as multiples of the fees."""
+    multipliers = []
+    for sentence in _sentences(text, "liab"):
+        for match in LIABILITY_MULTIPLIER.finditer(sentence):
+            digits, word, word_digits, twice = match.groups()
+            number = digits or word_digits
+            multipliers.append(
+                float(number) if number else WORD_NUMBERS[(word or twice).lower()]
+            )
+    return multipliers
+
+
+# (weight, findings, red flag) for a rule that applies to a document
+Check = Tuple[float, Dict[str, Any], Optional[str]]
+
+
+class RiskEngine:
+    """
+    Deterministic contract risk scoring from config/risk-rules.json.
+
+    Notice periods, governing law and liability caps are extracted with
+    compiled patterns and scored with the rule weights (0-10). A
+    document's `risk_score` is the mean weight of the rules that applied,
+    so assessing a contract takes milliseconds and needs no LLM call.
+    Rules with nothing to match in a document are reported as "unknown".
+    """
+
+    def __init__(
+        self,
+        rules: Dict[str, Any],
+        medium_threshold: float = 4,
+        high_threshold: float = 7,
+    ):
+        self.rules = rules
+        self.medium_threshold = medium_threshold
+        self.high_threshold = high_threshold
+
+    @classmethod
+    def load(cls, rules_file: str, **thresholds) -> "RiskEngine":
+        with open(Path(rules_file), "r", encoding="utf-8") as file:
+            return cls(json.load(file), **thresholds)
+
+    def risk_level(self, score: float) -> str:
+        if score >= self.high_threshold:
+            return "high"
+        if score >= self.medium_threshold:
+            return "medium"
+        return "low"
+
+    def assess(self, text: str) -> Dict[str, Any]:
+        text = text or ""
+        checks = {
+            "termination_risk": self._termination(text),
+            "governing_law_risk": self._governing_law(text),
+            "liability_risk": self._liability(text),
+        }
+
+        assessment: Dict[str, Any] = {}
+        weights = []
+        red_flags = []
+        findings = {}
+        for name, check in checks.items():
+            if check is None:
+                assessment[name] = "unknown"
+                continue
+            weight, finding, red_flag = check
+            assessment[name] = self.risk_level(weight)
+            weights.append(weight)
+            findings.update(finding)
+            if red_flag:
+                red_flags.append(red_flag)
+
+        risk_score = round(sum(weights) / len(weights), 1) if weights else None
+        assessment.update(
+            {
+                "overall_risk": self.risk_level(risk_score) if weights else "unknown",
+                "risk_score": risk_score,
+                "review_required": "high" in assessment.values(),
+                "red_flags": red_flags,
+                "findings": findings,
+            }
+        )
+        return assessment
+
+    def _termination(self, text: str) -> Optional[Check]:
+        rules = self.rules.get("termination_rules")
+        periods = notice_periods(text)
+        if not rules or not periods:
+            return None
+        weights = rules["risk_weights"]
+        # The shortest notice period is the one a counterparty can use
+        days = min(periods)
+        if days < 30:
+            weight = weights["less_than_30"]
+        elif days <= 60:
+            weight = weights["30_to_60"]
+        else:
+            weight = weights["more_than_60"]
+        red_flag = None
+        if days < rules.get("min_notice_days", 0):
+            red_flag = (
+                f"Termination notice of {days} days is below the "
+                f"{rules['min_notice_days']}-day minimum"
+            )
+        return weight, {"notice_period_days": days}, red_flag
+
+    def _governing_law(self, text: str) -> Optional[Check]:
+        rules = self.rules.get("governing_law_rules")
+        found = jurisdictions(text)
+        if not rules or not found:
+            return None
+        weights = rules["risk_weights"]
+        approved = {name.lower() for name in rules.get("approved_jurisdictions", [])}
+        jurisdiction = found[0]
+        if jurisdiction.lower() in approved:
+            return weights["approved"], {"jurisdiction": jurisdiction}, None
+        if jurisdiction.lower() in US_STATES:
+            weight = weights["domestic_other"]
+        else:
+            weight = weights["international"]
+        red_flag = f"Governed by the laws of {jurisdiction}, which is not an approved jurisdiction"
+        return weight, {"jurisdiction": jurisdiction}, red_flag
+
+    def _liability(self, text: str) -> Optional[Check]:
+        rules = self.rules.get("liability_rules")
+        if not rules:
+            return None
+        weights = rules["risk_weights"]
+        if has_unlimited_liability(text):
+            return weights["unlimited"], {"liability_multiplier": None}, "Unlimited liability"
+        multipliers = liability_multipliers(text)
+        if not multipliers:
+            return None
+        multiplier = max(multipliers)
+        limit = rules.get("max_liability_multiplier")
+        if limit is not None and multiplier > limit:
+            red_flag = f"Liability cap of {multiplier:g}x the fees exceeds the {limit:g}x maximum"
+            return weights["high_multiplier"], {"liability_multiplier": multiplier}, red_flag
+        return weights["reasonable"], {"liability_multiplier": multiplier}, None
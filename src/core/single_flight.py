@@ -0,0 +1,119 @@
+import asyncio
+import hashlib
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Tuple
+
+from langchain_core.messages import BaseMessage
+
+from .metrics import LLM_REQUESTS
+
+
+def prompt_fingerprint(messages: List[BaseMessage], *model_parts: Any) -> str:
+    """
+    Hash of a rendered prompt and the model settings it is sent with, so two
+    calls with the same fingerprint would get equivalent responses.
+    """
+    digest = hashlib.sha256()
+    for part in model_parts:
+        digest.update(str(part).encode())
+        digest.update(b"\0")
+    for message in messages:
+        digest.update(message.type.encode())
+        digest.update(b"\0")
+        digest.update(str(message.content).encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class SingleFlight:
+    """
+    Coalesces identical concurrent calls: while a call for a key is in
+    flight, later callers with the same key await its result instead of
+    making their own. Nothing is kept once the call completes, so this is
+    not a cache.
+
+    The shared call runs as its own task and callers await it shielded, so
+    one caller disconnecting does not cancel it for the others. Once every
+    caller has been cancelled, the call is cancelled too.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Tuple[int, str], asyncio.Task] = {}
+        self._callers: Dict[asyncio.Task, int] = {}
+
+    async def run(self, key: str, call: Callable[[], Awaitable[Any]]) -> Any:
+        # Tasks belong to an event loop, so keep each loop's calls apart
+        flight_key = (id(asyncio.get_running_loop()), key)
+        task = self._calls.get(flight_key)
+        if task is None:
+            LLM_REQUESTS.labels(result="upstream").inc()
+            task = asyncio.ensure_future(call())
+            self._calls[flight_key] = task
+            task.add_done_callback(lambda done: self._forget(flight_key, done))
+        else:
+            LLM_REQUESTS.labels(result="coalesced").inc()
+
+        self._callers[task] = self._callers.get(task, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        finally:
+            self._callers[task] -= 1
+            if not self._callers[task]:
+                del self._callers[task]
+                if not task.done():
+                    # Nobody is waiting for the result any more
+                    self._forget(flight_key, task)
+                    task.cancel()
+
+    def _forget(self, flight_key: Tuple[int, str], task: asyncio.Task):
+        # A later call for the same key may already have replaced this one
+        if self._calls.get(flight_key) is task:
+            del self._calls[flight_key]
+
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+
+class TokenFeed:
+    """
+    The chunks of a shared streamed call, so callers that join the call
+    can replay its tokens from the first chunk on, including the chunks
+    streamed before they joined.
+    """
+
+    def __init__(self):
+        self.chunks: List[Any] = []
+        self.closed = False
+        self._changed = asyncio.Event()
+
+    async def collect(self, stream: AsyncIterator[Any]) -> Any:
+        """Publishes each chunk of `stream` and returns their sum."""
+        message = None
+        async for chunk in stream:
+            self.chunks.append(chunk)
+            self._notify()
+            message = chunk if message is None else message + chunk
+        return message
+
+    def close(self):
+        self.closed = True
+        self._notify()
+
+    def _notify(self):
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def replay(self) -> AsyncIterator[Any]:
+        """Yields every chunk, waiting for new ones until the feed is closed."""
+        index = 0
+        while True:
+            while index < len(self.chunks):
+                yield self.chunks[index]
+                index += 1
+            if self.closed:
+                return
+            await self._changed.wait()
+
+
+# Shared by every graph in the process, so identical questions from
+# different sessions are coalesced
+llm_requests = SingleFlight()
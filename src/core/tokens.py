@@ -0,0 +1,12 @@
+import math
+
+# Gemini and most BPE tokenizers average roughly four characters of English
+# text per token. This is only used for budgeting, never for billing.
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap, tokenizer-free estimate of the number of tokens in a string."""
+    if not text:
+        return 0
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
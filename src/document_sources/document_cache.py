@@ -0,0 +1,67 @@
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+
+def file_content_hash(path: Path) -> str:
+    """SHA-256 of a file's bytes, read in blocks so large PDFs stay cheap."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class DocumentCache:
+    """
+    On-disk cache of extracted document text and metadata.
+
+    Entries are keyed by the file's content hash and the extractor version, so
+    renaming a file still hits the cache while editing it, or changing the
+    extraction code, misses.
+    """
+
+    def __init__(self, cache_dir: str, extractor_version: str):
+        self.cache_dir = Path(cache_dir)
+        self.extractor_version = extractor_version
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _entry_path(self, content_hash: str) -> Path:
+        return self.cache_dir / f"v{self.extractor_version}-{content_hash}.json"
+
+    def get(self, content_hash: str) -> Optional[Dict[str, Any]]:
+        entry_path = self._entry_path(content_hash)
+        if not entry_path.exists():
+            return None
+        try:
+            with open(entry_path, "r", encoding="utf-8") as file:
+                return json.load(file)
+        except Exception as e:
+            print(f"Ignoring unreadable cache entry {entry_path.name}: {e}")
+            return None
+
+    def put(self, content_hash: str, document: Dict[str, Any]):
+        entry_path = self._entry_path(content_hash)
+        tmp_path = None
+        try:
+            # A unique temp file per write: threads of one process (ingest_workers=0)
+            # may write the same entry at once
+            with tempfile.NamedTemporaryFile(
+                "w",
+                encoding="utf-8",
+                dir=self.cache_dir,
+                prefix=f"{entry_path.stem}.",
+                suffix=".tmp",
+                delete=False,
+            ) as file:
+                tmp_path = Path(file.name)
+                json.dump(document, file)
+            # Atomic rename so concurrent workers never read a partial entry
+            os.replace(tmp_path, entry_path)
+        except Exception as e:
+            print(f"Error writing cache entry {entry_path.name}: {e}")
+            if tmp_path is not None:
+                tmp_path.unlink(missing_ok=True)
@@ -0,0 +1,174 @@
+import asyncio
+import hashlib
+import time
+from pathlib import Path
+from typing import Dict, Any, Iterable, Iterator, List, Optional
+
+from core.risk_engine import RiskEngine
+from document_sources.local_file_source import LocalFileSource
+from retrieval.clause_index import ClauseIndex
+
+
+def document_pages(document: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """
+    Yields {"page_number", "text"} for each page of a loaded PDF document,
+    sliced from its content by the page offsets recorded at extraction.
+    """
+    content = document["content"]
+    offsets = document["metadata"]["page_offsets"]
+    for index, (page_number, start) in enumerate(offsets):
+        end = offsets[index + 1][1] if index + 1 < len(offsets) else len(content)
+        yield {"page_number": page_number, "text": content[start:end].strip()}
+
+
+async def _load_timed(
+    doc_source: LocalFileSource, file_path: Path
+) -> Optional[Dict[str, Any]]:
+    started = time.perf_counter()
+    try:
+        document = await doc_source.load_document(str(file_path))
+    except Exception as e:
+        print(f"❌ Error loading document {file_path.name}: {e}")
+        return None
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    print(f"Loaded document: {file_path.name} ({elapsed_ms:.0f} ms)")
+    return document
+
+
+async def load_knowledge_base(
+    knowledge_base_path: Path, doc_source: LocalFileSource
+) -> List[Dict[str, Any]]:
+    """
+    Loads every supported document in the knowledge base directory, in a
+    stable (sorted) order. Documents are extracted concurrently in the
+    source's process pool; documents that fail to load are skipped.
+    """
+    if not knowledge_base_path.exists():
+        print(f"⚠️ Knowledge base path does not exist: {knowledge_base_path}")
+        return []
+
+    file_paths = [
+        file_path
+        for file_path in sorted(knowledge_base_path.glob("*"))
+        if doc_source.validate_source(str(file_path))
+    ]
+
+    try:
+        # gather() returns results in submission order, whatever order they finish in
+        documents = await asyncio.gather(
+            *(_load_timed(doc_source, file_path) for file_path in file_paths)
+        )
+    finally:
+        doc_source.shutdown()
+
+    return [document for document in documents if document is not None]
+
+
+class KnowledgeBase:
+    """
+    The set of documents loaded from the knowledge base directory, keyed by
+    filename. Supports incremental refreshes so that only added, modified or
+    deleted files are re-ingested.
+
+    With a `risk_engine`, each document gets a `risk_assessment` when it is
+    ingested. It is computed after extraction rather than stored in the
+    document cache, so edits to the risk rules apply on the next load.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        doc_source: LocalFileSource,
+        risk_engine: Optional[RiskEngine] = None,
+    ):
+        self.path = Path(path)
+        self.doc_source = doc_source
+        self.risk_engine = risk_engine
+        self._documents: Dict[str, Dict[str, Any]] = {}
+
+    @property
+    def documents(self) -> List[Dict[str, Any]]:
+        return [self._documents[name] for name in sorted(self._documents)]
+
+    @property
+    def content_hash(self) -> str:
+        """Hash over every document's content hash; changes with any document."""
+        digest = hashlib.sha256()
+        for document in self.documents:
+            digest.update(document["filename"].encode())
+            digest.update(document.get("content_hash", "").encode())
+        return digest.hexdigest()
+
+    def _assess_risk(self, document: Dict[str, Any]):
+        if self.risk_engine is None:
+            return
+        assessment = self.risk_engine.assess(document["content"])
+        document["risk_assessment"] = assessment
+        print(
+            f"Risk assessment: {document['filename']}: {assessment['overall_risk']}"
+            f" (score {assessment['risk_score']})"
+        )
+
+    async def load(self):
+        documents = await load_knowledge_base(self.path, self.doc_source)
+        for document in documents:
+            self._assess_risk(document)
+        self._documents = {document["filename"]: document for document in documents}
+
+    async def refresh(self, changed_paths: Iterable[Path]) -> bool:
+        """
+        Re-ingests the given files (removing any that no longer exist).
+        Returns True if the knowledge base content actually changed.
+        """
+        changed = False
+        to_load = []
+        # Only top-level files, as load() sees them: files in subdirectories
+        # are never part of the knowledge base
+        directory = self.path.resolve()
+        top_level = {
+            Path(path) for path in changed_paths if Path(path).resolve().parent == directory
+        }
+        for file_path in top_level:
+            if self.doc_source.validate_source(str(file_path)):
+                to_load.append(file_path)
+            elif not file_path.exists() and file_path.name in self._documents:
+                print(f"Removed document: {file_path.name}")
+                del self._documents[file_path.name]
+                changed = True
+
+        try:
+            documents = await asyncio.gather(
+                *(_load_timed(self.doc_source, file_path) for file_path in to_load)
+            )
+        finally:
+            self.doc_source.shutdown()
+
+        for document in documents:
+            if document is None:
+                continue
+            previous = self._documents.get(document["filename"])
+            if previous and previous.get("content_hash") == document.get("content_hash"):
+                continue
+            self._assess_risk(document)
+            self._documents[document["filename"]] = document
+            changed = True
+        return changed
+
+    def full_context(self) -> str:
+        """All documents concatenated, for prompts that use the whole knowledge base."""
+        full_doc_context = ""
+        for document in self.documents:
+            full_doc_context += (
+                f"\n\n--- Document: {document['filename']} ---\n\n{document['content']}"
+            )
+        return full_doc_context
+
+    def build_clause_index(self, max_clause_tokens: int = 400) -> ClauseIndex:
+        clause_index = ClauseIndex(max_clause_tokens=max_clause_tokens)
+        for document in self.documents:
+            if document.get("metadata", {}).get("page_offsets"):
+                # Clauses keep the page they start on
+                clause_index.add_pages(document["filename"], document_pages(document))
+            else:
+                clause_index.add_document(document["filename"], document["content"])
+        return clause_index
@@ -1,14 +1,204 @@
-import pdfplumber
-import docx
+import asyncio
+import hashlib
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterator, List, Optional
 from interfaces.document_source import DocumentSource
+from document_sources.document_cache import DocumentCache, file_content_hash
+
+
+# --- Extraction workers ---
+# Module-level functions so they can be pickled and run in a process pool.
+# pdfplumber and python-docx are imported on first use: they are slow to
+# import and a fully cached knowledge base never needs them.
+
+
+def _pdf_page_count(path: str) -> int:
+    import pdfplumber
+
+    with pdfplumber.open(path) as pdf:
+        return len(pdf.pages)
+
+
+def _iter_pdf_pages(
+    path: str, start: int = 0, stop: Optional[int] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yields the text of pages [start, stop) of a PDF one page at a time. Each
+    page's layout caches are released before moving on, so memory stays
+    bounded by a single page however long the document is.
+    """
+    import pdfplumber
+
+    pages = list(range(start + 1, stop + 1)) if stop is not None else None
+    with pdfplumber.open(path, pages=pages) as pdf:
+        for page in pdf.pages:
+            text = page.extract_text() or ""
+            page.close()
+            yield {"page_number": page.page_number, "text": text}
+
+
+def _extract_pdf_pages(path: str, start: int, stop: int) -> List[str]:
+    """Extracts the text of pages [start, stop) of a PDF."""
+    return [page["text"] for page in _iter_pdf_pages(path, start, stop)]
+
+
+# Bump whenever OCR output changes so cached page text is recomputed
+OCR_VERSION = "1"
+
+
+def _pdf_page_fingerprint(page, resolution: int, language: str) -> str:
+    """
+    Hash of what a page draws: its size, content streams and embedded
+    images. The same scanned page hashes the same in any file, so an
+    edited or re-exported copy of a scan only OCRs the pages that changed.
+    """
+    from pdfminer.pdftypes import resolve1
+
+    digest = hashlib.sha256()
+    digest.update(f"{OCR_VERSION}|{resolution}|{language}|".encode())
+    digest.update(f"{page.width}x{page.height}r{page.rotation}|".encode())
+    contents = page.page_obj.contents
+    for stream in contents if isinstance(contents, list) else [contents]:
+        stream = resolve1(stream)
+        if stream is not None:
+            digest.update(stream.get_data())
+    for image in page.images:
+        digest.update(image["stream"].get_data())
+    return digest.hexdigest()
+
+
+def _ocr_pdf_page(
+    path: str,
+    page_number: int,
+    resolution: int,
+    language: str,
+    cache_dir: Optional[str],
+) -> str:
+    """
+    OCRs one PDF page with Tesseract. The text is cached under `cache_dir`
+    by page fingerprint, so a page is only rasterized and OCRed once.
+    """
+    import pdfplumber
+
+    with pdfplumber.open(path, pages=[page_number]) as pdf:
+        page = pdf.pages[0]
+        cache = DocumentCache(str(Path(cache_dir) / "ocr"), OCR_VERSION) if cache_dir else None
+        page_hash = _pdf_page_fingerprint(page, resolution, language) if cache else None
+        cached = cache.get(page_hash) if cache else None
+        if cached is not None:
+            return cached["text"]
+
+        import pytesseract
+
+        try:
+            # Fails fast, before rasterizing, when Tesseract is not installed
+            pytesseract.get_tesseract_version()
+            image = page.to_image(resolution=resolution).original
+            text = pytesseract.image_to_string(image, lang=language)
+        except (pytesseract.TesseractNotFoundError, pytesseract.TesseractError) as e:
+            # pytesseract's errors cannot be unpickled, which would break the pool
+            raise RuntimeError(str(e)) from None
+
+    if cache:
+        cache.put(page_hash, {"text": text})
+    return text
+
+
+def _extract_docx(path: str) -> Dict[str, Any]:
+    import docx
+
+    doc = docx.Document(path)
+    text_content = ""
+
+    for paragraph in doc.paragraphs:
+        text_content += paragraph.text + "\n"
+
+    return {
+        "content": text_content.strip(),
+        "metadata": {"paragraphs": len(doc.paragraphs), "file_type": "docx"},
+    }
+
+
+def _extract_txt(path: str) -> Dict[str, Any]:
+    with open(path, "r", encoding="utf-8") as file:
+        content = file.read()
+
+    return {
+        "content": content,
+        "metadata": {"characters": len(content), "file_type": "txt"},
+    }
 
 
 class LocalFileSource(DocumentSource):
 
-    def __init__(self):
+    # Bump whenever extraction output changes so cached documents are re-parsed
+    EXTRACTOR_VERSION = "3"
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        pdf_pages_per_task: int = 20,
+        ocr: bool = True,
+        ocr_min_chars: int = 20,
+        ocr_resolution: int = 300,
+        ocr_language: str = "eng",
+    ):
+        """
+        Extraction runs in a process pool of `max_workers` processes (defaults
+        to the CPU count; 0 runs it on the event loop's default thread pool).
+        PDFs are split into tasks of `pdf_pages_per_task` pages so a single
+        large contract is also spread across cores.
+
+        PDF pages whose text layer has fewer than `ocr_min_chars` characters
+        (scans) are rasterized at `ocr_resolution` DPI and OCRed with
+        Tesseract, one page per task in the same pool. Pages with a text
+        layer are never rasterized.
+        """
         self.supported_formats = ["pdf", "docx", "txt"]
+        self.cache_dir = cache_dir
+        self.ocr = ocr
+        self.ocr_min_chars = ocr_min_chars
+        self.ocr_resolution = ocr_resolution
+        self.ocr_language = ocr_language
+        self.cache = DocumentCache(cache_dir, self._cache_version()) if cache_dir else None
+        self.max_workers = max_workers
+        self.pdf_pages_per_task = max(1, pdf_pages_per_task)
+        self._executor: Optional[Executor] = None
+
+    def _cache_version(self) -> str:
+        """
+        Version of cached documents: the extractor version and the OCR
+        settings, which change the text of scanned pages. A document cached
+        with OCR off, e.g. by warm_cache.py, is re-extracted once it is on.
+        """
+        if not self.ocr:
+            return f"{self.EXTRACTOR_VERSION}-noocr"
+        return (
+            f"{self.EXTRACTOR_VERSION}-ocr{OCR_VERSION}-{self.ocr_min_chars}"
+            f"-{self.ocr_resolution}-{self.ocr_language}"
+        )
+
+    def _get_executor(self) -> Optional[Executor]:
+        # Created lazily so a fully cached knowledge base never starts the pool
+        if self._executor is None and self.max_workers != 0:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    def shutdown(self):
+        """Stops the extraction process pool; it is recreated on demand."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    async def _run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), func, *args)
 
     def get_supported_formats(self) -> List[str]:
         return self.supported_formats
@@ -24,11 +214,63 @@ class LocalFileSource(DocumentSource):
         except Exception:
             return False
 
+    def _needs_ocr(self, text: str) -> bool:
+        return self.ocr and len(text.strip()) < self.ocr_min_chars
+
+    async def _ocr_pages(self, path: Path, page_numbers: List[int]) -> Dict[int, str]:
+        """OCRs the given pages in parallel; pages that fail keep no text."""
+        results = await asyncio.gather(
+            *(
+                self._run(
+                    _ocr_pdf_page,
+                    str(path),
+                    page_number,
+                    self.ocr_resolution,
+                    self.ocr_language,
+                    self.cache_dir,
+                )
+                for page_number in page_numbers
+            ),
+            return_exceptions=True,
+        )
+        texts = {}
+        failures = []
+        for page_number, result in zip(page_numbers, results):
+            if isinstance(result, Exception):
+                failures.append(result)
+            else:
+                texts[page_number] = result
+        if failures:
+            print(
+                f"⚠️ OCR failed for {len(failures)} of {len(page_numbers)} "
+                f"pages of {path.name}: {failures[0]}"
+            )
+        return texts
+
     async def load_document(self, source_path: str) -> Dict[str, Any]:
         if not self.validate_source(source_path):
             raise ValueError(f"Invalid source path: {source_path}")
 
         path = Path(source_path)
+        # Hashing and cache I/O read and write whole files; keep the loop free
+        content_hash = await asyncio.to_thread(file_content_hash, path)
+
+        cached = (
+            await asyncio.to_thread(self.cache.get, content_hash) if self.cache else None
+        )
+        if cached is not None:
+            cached["source_path"] = str(path)
+            cached["filename"] = path.name
+            return cached
+
+        document = await self._process(path)
+        document["content_hash"] = content_hash
+        # Documents with pages that could not be OCRed are retried next time
+        if self.cache and not document["metadata"].get("ocr_failed_pages"):
+            await asyncio.to_thread(self.cache.put, content_hash, document)
+        return document
+
+    async def _process(self, path: Path) -> Dict[str, Any]:
         file_extension = path.suffix.lower()
 
         if file_extension == ".pdf":
@@ -42,15 +284,46 @@ class LocalFileSource(DocumentSource):
 
     async def _process_pdf(self, path: Path) -> Dict[str, Any]:
         try:
-            text_content = ""
-            metadata = {"pages": 0, "file_type": "pdf"}
+            page_count = await self._run(_pdf_page_count, str(path))
+            step = self.pdf_pages_per_task
+            page_batches = await asyncio.gather(
+                *(
+                    self._run(
+                        _extract_pdf_pages, str(path), start, min(start + step, page_count)
+                    )
+                    for start in range(0, page_count, step)
+                )
+            )
+            page_texts = [text for batch in page_batches for text in batch]
+
+            scanned_pages = [
+                page_number
+                for page_number, text in enumerate(page_texts, start=1)
+                if self._needs_ocr(text)
+            ]
+            ocr_texts = await self._ocr_pages(path, scanned_pages) if scanned_pages else {}
+            for page_number, text in ocr_texts.items():
+                page_texts[page_number - 1] = text
 
-            with pdfplumber.open(path) as pdf:
-                metadata["pages"] = len(pdf.pages)
-                for page in pdf.pages:
-                    if page.extract_text():
-                        text_content += page.extract_text() + "\n"
+            # Where each page starts in the content, so it can be indexed
+            # page by page (KnowledgeBase.build_clause_index)
+            page_offsets = []
+            offset = 0
+            for page_number, text in enumerate(page_texts, start=1):
+                if text:
+                    page_offsets.append([page_number, offset])
+                    offset += len(text) + 1
+            text_content = "\n".join(text for text in page_texts if text)
+            leading = len(text_content) - len(text_content.lstrip())
+            page_offsets = [
+                [page_number, max(0, start - leading)] for page_number, start in page_offsets
+            ]
 
+            metadata = {"pages": page_count, "file_type": "pdf", "page_offsets": page_offsets}
+            if ocr_texts:
+                metadata["ocr_pages"] = sorted(ocr_texts)
+            if len(ocr_texts) < len(scanned_pages):
+                metadata["ocr_failed_pages"] = sorted(set(scanned_pages) - set(ocr_texts))
             return {
                 "content": text_content.strip(),
                 "metadata": metadata,
@@ -62,35 +335,16 @@ class LocalFileSource(DocumentSource):
 
     async def _process_docx(self, path: Path) -> Dict[str, Any]:
         try:
-            doc = docx.Document(path)
-            text_content = ""
-
-            for paragraph in doc.paragraphs:
-                text_content += paragraph.text + "\n"
-
-            metadata = {"paragraphs": len(doc.paragraphs), "file_type": "docx"}
-
-            return {
-                "content": text_content.strip(),
-                "metadata": metadata,
-                "source_path": str(path),
-                "filename": path.name,
-            }
+            document = await self._run(_extract_docx, str(path))
+            document.update({"source_path": str(path), "filename": path.name})
+            return document
         except Exception as e:
             raise Exception(f"Error processing DOCX: {e}")
 
     async def _process_txt(self, path: Path) -> Dict[str, Any]:
         try:
-            with open(path, "r", encoding="utf-8") as file:
-                content = file.read()
-
-            metadata = {"characters": len(content), "file_type": "txt"}
-
-            return {
-                "content": content,
-                "metadata": metadata,
-                "source_path": str(path),
-                "filename": path.name,
-            }
+            document = await self._run(_extract_txt, str(path))
+            document.update({"source_path": str(path), "filename": path.name})
+            return document
         except Exception as e:
             raise Exception(f"Error processing TXT: {e}")
@@ -0,0 +1,29 @@
+from abc import ABC, abstractmethod
+from typing import Dict, Any, List, Optional
+
+
+class SessionStore(ABC):
+
+    @abstractmethod
+    async def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        pass
+
+    @abstractmethod
+    async def save(self, session_id: str, session: Dict[str, Any]) -> None:
+        pass
+
+    @abstractmethod
+    async def delete(self, session_id: str) -> bool:
+        pass
+
+    @abstractmethod
+    async def purge_expired(self) -> int:
+        pass
+
+    @abstractmethod
+    async def pending_escalations(self) -> List[Dict[str, Any]]:
+        pass
+
+    @abstractmethod
+    async def stats(self) -> Dict[str, Any]:
+        pass
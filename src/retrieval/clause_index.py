@@ -0,0 +1,222 @@
+import math
+import re
+from collections import Counter, defaultdict
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
+
+from core.tokens import estimate_tokens
+
+# A clause starts at a line that opens with a numbered heading such as
+# "5.", "5.2", "5.2.1" or "Section 5.2" / "Article IV" / "Schedule 2".
+CLAUSE_HEADING = re.compile(
+    r"^[ \t]*(?:(?:section|article|clause|schedule|exhibit|annex)\s+[0-9ivxlc]+(?:\.\d+)*\.?"
+    r"|\d+\.(?:\d+\.?)*)(?=[ \t]+\S)",
+    re.IGNORECASE | re.MULTILINE,
+)
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:[.'][a-z0-9]+)*")
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "can", "do", "does", "for",
+    "from", "has", "have", "how", "i", "if", "in", "is", "it", "its", "of", "on",
+    "or", "our", "shall", "that", "the", "their", "this", "to", "under", "was",
+    "we", "what", "when", "which", "will", "with", "would", "you", "your",
+}
+
+# Heading-only fragments shorter than this are merged into the next clause.
+MIN_CLAUSE_CHARS = 80
+
+
+def _stem(term: str) -> str:
+    """Very light suffix stripping so "terminates" matches "termination"."""
+    for suffix, replacement in (
+        ("ations", "ate"),
+        ("ation", "ate"),
+        ("ies", "y"),
+        ("ing", ""),
+        ("ed", ""),
+        ("es", ""),
+        ("s", ""),
+    ):
+        if term.endswith(suffix) and len(term) - len(suffix) >= 3:
+            return term[: -len(suffix)] + replacement
+    return term
+
+
+def tokenize(text: str) -> List[str]:
+    return [
+        _stem(term)
+        for term in TOKEN_PATTERN.findall(text.lower())
+        if term not in STOPWORDS
+    ]
+
+
+def split_into_clauses(text: str, max_clause_tokens: int = 400) -> List[str]:
+    """
+    Splits contract text at numbered clause headings. Clauses longer than
+    `max_clause_tokens` are further split on line boundaries.
+    """
+    starts = [match.start() for match in CLAUSE_HEADING.finditer(text)]
+    if not starts or starts[0] != 0:
+        starts.insert(0, 0)
+    starts.append(len(text))
+
+    segments = []
+    pending = ""
+    for start, end in zip(starts, starts[1:]):
+        segment = text[start:end].strip()
+        if not segment:
+            continue
+        segment = f"{pending}\n{segment}".strip() if pending else segment
+        if len(segment) < MIN_CLAUSE_CHARS and end != len(text):
+            pending = segment
+            continue
+        pending = ""
+        segments.append(segment)
+    if pending:
+        segments.append(pending)
+
+    clauses = []
+    max_chars = max_clause_tokens * 4
+    for segment in segments:
+        if estimate_tokens(segment) <= max_clause_tokens:
+            clauses.append(segment)
+            continue
+        window = ""
+        for line in segment.splitlines():
+            if window and len(window) + len(line) + 1 > max_chars:
+                clauses.append(window.strip())
+                window = ""
+            window += line + "\n"
+        if window.strip():
+            clauses.append(window.strip())
+    return clauses
+
+
+def iter_clauses(
+    pages: Iterable[Dict[str, Any]], max_clause_tokens: int = 400
+) -> Iterator[Tuple[Optional[int], str]]:
+    """
+    Splits a stream of {"page_number", "text"} pages into clauses, yielding
+    (starting page number, clause text). Only the clause that is still open
+    at the end of a page is buffered, so whole documents never need to be
+    held in memory.
+    """
+    buffer = ""
+    buffer_page = None
+    for page in pages:
+        if not page["text"]:
+            continue
+        if not buffer:
+            buffer_page = page["page_number"]
+        buffer = f"{buffer}\n{page['text']}" if buffer else page["text"]
+        clauses = split_into_clauses(buffer, max_clause_tokens)
+        for position, clause in enumerate(clauses[:-1]):
+            yield (buffer_page if position == 0 else page["page_number"]), clause
+        if len(clauses) > 1:
+            buffer_page = page["page_number"]
+        buffer = clauses[-1] if clauses else ""
+    if buffer:
+        yield buffer_page, buffer
+
+
+class ClauseIndex:
+    """
+    In-memory BM25 index over the clauses of every knowledge base document.
+    Lets the graph send only the clauses relevant to a query to the LLM
+    instead of the whole knowledge base.
+    """
+
+    def __init__(self, max_clause_tokens: int = 400, k1: float = 1.5, b: float = 0.75):
+        self.max_clause_tokens = max_clause_tokens
+        self.k1 = k1
+        self.b = b
+        self.clauses: List[Dict[str, Any]] = []
+        self._postings: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+        self._lengths: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self.clauses)
+
+    def add_document(self, source: str, text: str):
+        for clause_text in split_into_clauses(text, self.max_clause_tokens):
+            self._add_clause(source, clause_text)
+
+    def add_pages(self, source: str, pages: Iterable[Dict[str, Any]]):
+        """
+        Indexes a document page by page, e.g. from knowledge_base.document_pages().
+        Each clause records its start page, which build_context shows.
+        """
+        for page_number, clause_text in iter_clauses(pages, self.max_clause_tokens):
+            self._add_clause(source, clause_text, page_number)
+
+    def _add_clause(self, source: str, text: str, page_number: Optional[int] = None):
+        position = len(self.clauses)
+        terms = tokenize(text)
+        self.clauses.append(
+            {
+                "id": position,
+                "source": source,
+                "page": page_number,
+                "heading": text.splitlines()[0][:80],
+                "text": text,
+                "tokens": estimate_tokens(text),
+            }
+        )
+        self._lengths.append(len(terms))
+        for term, frequency in Counter(terms).items():
+            self._postings[term].append((position, frequency))
+
+    def search(self, query: str, top_k: int = 8) -> List[Tuple[Dict[str, Any], float]]:
+        """Returns up to `top_k` (clause, score) pairs, best first."""
+        if not self.clauses:
+            return []
+
+        total = len(self.clauses)
+        average_length = sum(self._lengths) / total or 1.0
+        scores: Dict[int, float] = defaultdict(float)
+
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (total - len(postings) + 0.5) / (len(postings) + 0.5))
+            for position, frequency in postings:
+                length_norm = 1 - self.b + self.b * self._lengths[position] / average_length
+                scores[position] += idf * (
+                    frequency * (self.k1 + 1) / (frequency + self.k1 * length_norm)
+                )
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        return [(self.clauses[position], score) for position, score in ranked[:top_k]]
+
+    def build_context(self, query: str, top_k: int = 8, token_budget: int = 3000) -> str:
+        """
+        Builds a prompt-ready context from the best matching clauses, keeping
+        within `token_budget`. Clauses are emitted in document order, marked
+        with their page where known. When nothing matches, the opening
+        clauses (parties, definitions) are used.
+        """
+        candidates = [clause for clause, _ in self.search(query, top_k)]
+        if not candidates:
+            candidates = self.clauses[:top_k]
+
+        selected = []
+        used_tokens = 0
+        for clause in candidates:
+            if used_tokens + clause["tokens"] > token_budget:
+                continue
+            selected.append(clause)
+            used_tokens += clause["tokens"]
+        selected.sort(key=lambda clause: clause["id"])
+
+        context = ""
+        current_source = current_page = None
+        for clause in selected:
+            if clause["source"] != current_source:
+                current_source, current_page = clause["source"], None
+                context += f"\n\n--- Document: {current_source} ---\n\n"
+            if clause["page"] is not None and clause["page"] != current_page:
+                current_page = clause["page"]
+                context += f"[Page {current_page}]\n"
+            context += clause["text"] + "\n\n"
+        return context.strip()
@@ -0,0 +1,133 @@
+import sys
+import time
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional
+
+from interfaces.session_store import SessionStore
+
+# Rough per-message overhead of a LangChain message object beyond its text
+MESSAGE_OVERHEAD_BYTES = 600
+
+
+def estimate_session_size(session: Dict[str, Any]) -> int:
+    """Approximate memory held by a session, dominated by its message history."""
+    size = sys.getsizeof(session)
+    for value in session.values():
+        if isinstance(value, str):
+            size += sys.getsizeof(value)
+        elif isinstance(value, list):
+            for message in value:
+                size += MESSAGE_OVERHEAD_BYTES + sys.getsizeof(
+                    getattr(message, "content", message)
+                )
+    return size
+
+
+class InMemorySessionStore(SessionStore):
+    """
+    Process-local session store with LRU eviction.
+
+    Sessions are evicted when they have been idle for `idle_ttl_seconds`, or
+    least-recently-used first when the store holds more than `max_entries`
+    sessions or more than `max_memory_bytes` of (estimated) session data.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1000,
+        idle_ttl_seconds: Optional[float] = 3600,
+        max_memory_bytes: Optional[int] = None,
+    ):
+        self.max_entries = max_entries
+        self.idle_ttl_seconds = idle_ttl_seconds
+        self.max_memory_bytes = max_memory_bytes
+        # session_id -> (session, last_access, size); oldest access first
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._total_bytes = 0
+        self._counters = {
+            "hits": 0,
+            "misses": 0,
+            "evictions_ttl": 0,
+            "evictions_capacity": 0,
+            "evictions_memory": 0,
+        }
+
+    async def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        self._purge_expired()
+        entry = self._entries.get(session_id)
+        if entry is None:
+            self._counters["misses"] += 1
+            return None
+        session, _, size = entry
+        self._entries[session_id] = (session, time.monotonic(), size)
+        self._entries.move_to_end(session_id)
+        self._counters["hits"] += 1
+        return session
+
+    async def save(self, session_id: str, session: Dict[str, Any]) -> None:
+        self._remove(session_id)
+        size = estimate_session_size(session)
+        self._entries[session_id] = (session, time.monotonic(), size)
+        self._total_bytes += size
+
+        self._purge_expired()
+        # Never evict the session that is being saved
+        while len(self._entries) > 1 and len(self._entries) > self.max_entries:
+            self._evict_oldest("evictions_capacity")
+        while (
+            len(self._entries) > 1
+            and self.max_memory_bytes
+            and self._total_bytes > self.max_memory_bytes
+        ):
+            self._evict_oldest("evictions_memory")
+
+    async def delete(self, session_id: str) -> bool:
+        return self._remove(session_id)
+
+    async def purge_expired(self) -> int:
+        before = len(self._entries)
+        self._purge_expired()
+        return before - len(self._entries)
+
+    async def pending_escalations(self) -> List[Dict[str, Any]]:
+        return [
+            {
+                "escalated_question": session.get("escalated_question"),
+                "prepared_briefing": session["prepared_briefing"],
+            }
+            for session, _, _ in self._entries.values()
+            if session.get("prepared_briefing")
+        ]
+
+    async def stats(self) -> Dict[str, Any]:
+        lookups = self._counters["hits"] + self._counters["misses"]
+        return {
+            "entries": len(self._entries),
+            "memory_bytes": self._total_bytes,
+            "hit_rate": self._counters["hits"] / lookups if lookups else 0.0,
+            **self._counters,
+        }
+
+    def _remove(self, session_id: str) -> bool:
+        entry = self._entries.pop(session_id, None)
+        if entry is None:
+            return False
+        self._total_bytes -= entry[2]
+        return True
+
+    def _evict_oldest(self, counter: str):
+        session_id = next(iter(self._entries))
+        self._remove(session_id)
+        self._counters[counter] += 1
+
+    def _purge_expired(self):
+        if not self.idle_ttl_seconds:
+            return
+        cutoff = time.monotonic() - self.idle_ttl_seconds
+        # Entries are ordered by last access, so expired ones are at the front
+        while self._entries:
+            session_id, (_, last_access, _) = next(iter(self._entries.items()))
+            if last_access > cutoff:
+                break
+            self._remove(session_id)
+            self._counters["evictions_ttl"] += 1
@@ -0,0 +1,188 @@
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+from langchain_core.messages import messages_from_dict, messages_to_dict
+
+from interfaces.session_store import SessionStore
+
+
+def serialize_session(session: Dict[str, Any]) -> str:
+    data = dict(session)
+    data["conversation_history"] = messages_to_dict(
+        session.get("conversation_history", [])
+    )
+    return json.dumps(data)
+
+
+def deserialize_session(payload: str) -> Dict[str, Any]:
+    data = json.loads(payload)
+    data["conversation_history"] = messages_from_dict(
+        data.get("conversation_history", [])
+    )
+    return data
+
+
+class SQLiteSessionStore(SessionStore):
+    """
+    Session store backed by a SQLite database in WAL mode, so every uvicorn
+    worker (and every restart) sees the same conversations and pending
+    lawyer escalations. Database calls run in a worker thread to keep the
+    event loop free.
+    """
+
+    def __init__(self, db_path: str, idle_ttl_seconds: Optional[float] = 3600):
+        self.db_path = Path(db_path)
+        self.idle_ttl_seconds = idle_ttl_seconds
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            self.db_path, timeout=30, check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS sessions (
+                session_id TEXT PRIMARY KEY,
+                data TEXT NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_sessions_updated_at
+                ON sessions (updated_at);
+            CREATE TABLE IF NOT EXISTS escalations (
+                session_id TEXT PRIMARY KEY,
+                escalated_question TEXT,
+                prepared_briefing TEXT NOT NULL,
+                created_at REAL NOT NULL
+            );
+            """
+        )
+        self._counters = {"hits": 0, "misses": 0, "evictions_ttl": 0}
+
+    def _execute(self, sql: str, params: tuple = ()) -> List[tuple]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def _get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        rows = self._execute(
+            "SELECT data, updated_at FROM sessions WHERE session_id = ?",
+            (session_id,),
+        )
+        if not rows:
+            self._counters["misses"] += 1
+            return None
+        payload, updated_at = rows[0]
+        if self.idle_ttl_seconds and updated_at < time.time() - self.idle_ttl_seconds:
+            self._delete(session_id)
+            self._counters["evictions_ttl"] += 1
+            self._counters["misses"] += 1
+            return None
+        self._counters["hits"] += 1
+        return deserialize_session(payload)
+
+    def _save(self, session_id: str, session: Dict[str, Any]):
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "INSERT INTO sessions (session_id, data, updated_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT(session_id) DO UPDATE SET "
+                    "data = excluded.data, updated_at = excluded.updated_at",
+                    (session_id, serialize_session(session), now),
+                )
+                if session.get("prepared_briefing"):
+                    self._conn.execute(
+                        "INSERT INTO escalations "
+                        "(session_id, escalated_question, prepared_briefing, created_at) "
+                        "VALUES (?, ?, ?, ?) ON CONFLICT(session_id) DO UPDATE SET "
+                        "escalated_question = excluded.escalated_question, "
+                        "prepared_briefing = excluded.prepared_briefing",
+                        (
+                            session_id,
+                            session.get("escalated_question"),
+                            session["prepared_briefing"],
+                            now,
+                        ),
+                    )
+                else:
+                    self._conn.execute(
+                        "DELETE FROM escalations WHERE session_id = ?", (session_id,)
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def _delete(self, session_id: str) -> bool:
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM sessions WHERE session_id = ?", (session_id,)
+            )
+            self._conn.execute(
+                "DELETE FROM escalations WHERE session_id = ?", (session_id,)
+            )
+            return cursor.rowcount > 0
+
+    def _purge_expired(self) -> int:
+        if not self.idle_ttl_seconds:
+            return 0
+        cutoff = time.time() - self.idle_ttl_seconds
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM escalations WHERE session_id IN "
+                "(SELECT session_id FROM sessions WHERE updated_at < ?)",
+                (cutoff,),
+            )
+            cursor = self._conn.execute(
+                "DELETE FROM sessions WHERE updated_at < ?", (cutoff,)
+            )
+        self._counters["evictions_ttl"] += cursor.rowcount
+        return cursor.rowcount
+
+    async def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        return await asyncio.to_thread(self._get, session_id)
+
+    async def save(self, session_id: str, session: Dict[str, Any]) -> None:
+        await asyncio.to_thread(self._save, session_id, session)
+
+    async def delete(self, session_id: str) -> bool:
+        return await asyncio.to_thread(self._delete, session_id)
+
+    async def purge_expired(self) -> int:
+        return await asyncio.to_thread(self._purge_expired)
+
+    async def pending_escalations(self) -> List[Dict[str, Any]]:
+        """Escalated questions still waiting for a lawyer, oldest first."""
+        rows = await asyncio.to_thread(
+            self._execute,
+            "SELECT escalated_question, prepared_briefing, created_at "
+            "FROM escalations ORDER BY created_at",
+        )
+        return [
+            {
+                "escalated_question": question,
+                "prepared_briefing": briefing,
+                "created_at": created_at,
+            }
+            for question, briefing, created_at in rows
+        ]
+
+    def _count(self, table: str) -> int:
+        return self._execute(f"SELECT COUNT(*) FROM {table}")[0][0]
+
+    async def stats(self) -> Dict[str, Any]:
+        entries = await asyncio.to_thread(self._count, "sessions")
+        pending = await asyncio.to_thread(self._count, "escalations")
+        lookups = self._counters["hits"] + self._counters["misses"]
+        return {
+            "entries": entries,
+            "pending_escalations": pending,
+            "hit_rate": self._counters["hits"] / lookups if lookups else 0.0,
+            **self._counters,
+        }
@@ -90,10 +90,15 @@ document.addEventListener("DOMContentLoaded", () => {
   let ws;
   let lastUserMessageEl = null; // To track the last user message element for the reaction
   let reactionTimeout = null; // To control the timeout for showing the reaction
+  let streamingMessageEl = null; // Lumen AI bubble currently receiving streamed tokens
+  const amendableMessages = new Map(); // answer_id -> bubble that may still be amended
 
   function connectWebSocket() {
     const protocol = window.location.protocol === "https:" ? "wss:" : "ws:";
-    ws = new WebSocket(`${protocol}//${window.location.host}/ws`);
+    // Reconnect with the previous session id so the conversation resumes
+    const sessionId = sessionStorage.getItem("lumenSessionId");
+    const query = sessionId ? `?session_id=${encodeURIComponent(sessionId)}` : "";
+    ws = new WebSocket(`${protocol}//${window.location.host}/ws${query}`);
 
     ws.onopen = () => {
       status.textContent = "Connected";
@@ -120,10 +125,40 @@ document.addEventListener("DOMContentLoaded", () => {
   }
 
   function handleIncomingMessage(data) {
+    if (data.type === "session") {
+      sessionStorage.setItem("lumenSessionId", data.session_id);
+      return;
+    }
+
+    if (data.type === "answer_amendment") {
+      // A follow-up to an answer already shown (progressive delivery); it
+      // may arrive after the user has moved on, so it only touches that bubble
+      const amendedEl = amendableMessages.get(data.answer_id);
+      if (amendedEl) {
+        amendedEl.querySelector("p").textContent = data.content;
+        amendableMessages.delete(data.answer_id);
+      }
+      return;
+    }
+
     // When Lumen AI sends a message, clear any existing reaction
     clearReaction();
 
-    if (data.type === "user_response") {
+    if (data.type === "user_response_delta") {
+      // Streamed tokens: open a bubble on the first token, then append to it
+      if (!streamingMessageEl) {
+        if (currentStatusElement) {
+          finalizeStatusMessage(
+            currentStatusElement,
+            currentStatusElement.textContent.replace(/\.\.\.$/, "")
+          );
+          currentStatusElement = null;
+        }
+        streamingMessageEl = appendMessage(userChatBox, "Lumen AI", "", "Lumen AI");
+      }
+      streamingMessageEl.querySelector("p").textContent += data.content;
+      userChatBox.scrollTop = userChatBox.scrollHeight;
+    } else if (data.type === "user_response") {
       // Finalize the current status before showing response
       if (currentStatusElement) {
         finalizeStatusMessage(
@@ -132,7 +167,18 @@ document.addEventListener("DOMContentLoaded", () => {
         );
         currentStatusElement = null;
       }
-      appendMessage(userChatBox, "Lumen AI", data.content, "Lumen AI");
+      let answerEl = streamingMessageEl;
+      if (answerEl) {
+        // The final frame is authoritative (it may include an enhancement)
+        answerEl.querySelector("p").textContent = data.content;
+        streamingMessageEl = null;
+        userChatBox.scrollTop = userChatBox.scrollHeight;
+      } else {
+        answerEl = appendMessage(userChatBox, "Lumen AI", data.content, "Lumen AI");
+      }
+      if (data.answer_id) {
+        amendableMessages.set(data.answer_id, answerEl);
+      }
     } else if (data.type === "lawyer_request") {
       // Finalize status as "escalated" when lawyer request is sent
       if (currentStatusElement) {
@@ -143,6 +189,9 @@ document.addEventListener("DOMContentLoaded", () => {
         currentStatusElement = null;
       }
       appendMessage(lawyerChatBox, "Lumen AI", data.content, "Lumen AI");
+    } else if (data.type === "error") {
+      // Stop appending to a partially streamed answer after a failed turn
+      streamingMessageEl = null;
     } else if (data.type === "status_update") {
       // Handle status updates from backend
       if (data.status === "escalation") {
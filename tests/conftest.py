@@ -0,0 +1,6 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+# The application and the benchmarks' fake LLM import from these directories
+sys.path[:0] = [str(ROOT / "src"), str(ROOT / "benchmarks")]
@@ -0,0 +1,39 @@
+from core.answer_cache import AnswerCache, normalize_query
+
+
+def test_case_and_punctuation_are_normalized():
+    assert normalize_query("What is the notice period?") == normalize_query(
+        "  what is the NOTICE period "
+    )
+
+
+def test_parties_and_directions_are_kept():
+    assert normalize_query("Can we terminate early?") != normalize_query(
+        "Can you terminate early?"
+    )
+    assert normalize_query("How do we give notice to the supplier?") != normalize_query(
+        "How do we give notice from the supplier?"
+    )
+
+
+def test_exact_hit_requires_the_same_parties():
+    cache = AnswerCache(similarity_threshold=None)
+    cache.put("Can we terminate early?", [], "kb", {"response_to_user": "Yes"})
+
+    assert cache.get("can we terminate early", [], "kb") == {"response_to_user": "Yes"}
+    assert cache.get("Can you terminate early?", [], "kb") is None
+
+
+def test_near_duplicates_must_name_the_same_contract():
+    cache = AnswerCache(similarity_threshold=0.8)
+    cache.put(
+        "What are the risks of terminating the IBM agreement?",
+        [],
+        "kb",
+        {"response_to_user": "IBM"},
+    )
+
+    assert cache.get("What are the risks of terminating the HP agreement?", [], "kb") is None
+    assert cache.get("what are risks of terminating the IBM agreement", [], "kb") == {
+        "response_to_user": "IBM"
+    }
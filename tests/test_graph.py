@@ -0,0 +1,66 @@
+import asyncio
+
+from common import build_graph, turn_state
+from fake_llm import FakeChatModel
+
+
+def run_turn(llm: FakeChatModel, path: str) -> dict:
+    return asyncio.run(build_graph(llm).ainvoke(turn_state(path)))
+
+
+def test_empty_answer_returns_error_message():
+    # An empty answer (e.g. a provider safety block) leaves no base response
+    final_state = run_turn(FakeChatModel(answer=""), "direct")
+
+    assert final_state["response_to_user"] == "An error occurred processing your request."
+
+
+def test_identical_calls_are_shared_only_at_the_same_priority():
+    from langchain_core.prompts import ChatPromptTemplate
+    from core.graph_nodes import invoke_llm
+
+    llm = FakeChatModel(latency=0.05)
+    prompt = ChatPromptTemplate.from_messages([("user", "What is the notice period?")])
+
+    async def run():
+        await asyncio.gather(
+            invoke_llm(prompt, llm, {}, priority="user"),
+            invoke_llm(prompt, llm, {}, priority="user"),
+            invoke_llm(prompt, llm, {}, priority="lawyer"),
+        )
+
+    asyncio.run(run())
+    assert llm.call_count == 2
+
+
+def test_shared_streamed_calls_send_tokens_to_every_caller():
+    from core.graph_nodes import SHARED_TOKEN, STREAMED_NODES
+
+    llm = FakeChatModel(latency=0.05)
+    graph = build_graph(llm)
+
+    async def answer_tokens():
+        tokens = []
+        async for event in graph.astream_events(turn_state("direct"), version="v2"):
+            shared = event["event"] == "on_custom_event" and event["name"] == SHARED_TOKEN
+            if event["event"] == "on_chat_model_stream" or shared:
+                if event["metadata"].get("langgraph_node") in STREAMED_NODES:
+                    tokens.append(event["data"]["chunk"].content)
+        return "".join(tokens)
+
+    async def run():
+        return await asyncio.gather(answer_tokens(), answer_tokens())
+
+    first, second = asyncio.run(run())
+    assert first and second == first
+    # Router, answer and enhancement, each made once for both turns
+    assert llm.call_count == 3
+
+
+def test_empty_approval_answer_returns_error_message():
+    # Without a proposed answer line the approved briefing is rewritten by the LLM
+    state = turn_state("approve")
+    state["prepared_briefing"] = "User asks: Can we terminate early? Section 5.2 applies."
+    final_state = asyncio.run(build_graph(FakeChatModel(answer="")).ainvoke(state))
+
+    assert final_state["response_to_user"] == "An error occurred processing your request."
@@ -0,0 +1,38 @@
+import asyncio
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+from core.history_manager import HistoryManager
+from fake_llm import FakeChatModel
+
+
+def count_compactions(manager: HistoryManager, turns: int, answer_words: int) -> int:
+    llm = FakeChatModel(answer="Summary.")
+    history, summary, compactions = [], None, 0
+
+    async def run():
+        nonlocal history, summary, compactions
+        for turn in range(turns):
+            history = history + [
+                HumanMessage(content=f"Question {turn}?"),
+                AIMessage(content=" ".join(["clause"] * answer_words)),
+            ]
+            if manager.needs_compaction(history):
+                history, summary = await manager.compact(history, summary, llm)
+                compactions += 1
+
+    asyncio.run(run())
+    return compactions
+
+
+def test_short_turns_are_compacted_in_batches():
+    manager = HistoryManager(keep_last_turns=6, compact_batch_turns=4)
+
+    assert count_compactions(manager, 24, answer_words=20) == 4
+
+
+def test_long_turns_are_not_compacted_on_every_turn():
+    # Five answers fill the token limit before the turn count is reached
+    manager = HistoryManager(keep_last_turns=6, compact_batch_turns=4, max_history_tokens=2000)
+
+    assert count_compactions(manager, 24, answer_words=300) <= 24 // 3
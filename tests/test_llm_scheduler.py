@@ -0,0 +1,32 @@
+import asyncio
+
+import pytest
+
+from core.llm_scheduler import LLMScheduler
+
+
+class RateLimited(Exception):
+    status_code = 429
+
+
+def run_flaky(can_retry=None) -> list:
+    scheduler = LLMScheduler(base_delay_seconds=0)
+    attempts = []
+
+    async def flaky():
+        attempts.append(len(attempts))
+        if len(attempts) == 1:
+            raise RateLimited()
+        return "ok"
+
+    asyncio.run(scheduler.run(flaky, can_retry=can_retry))
+    return attempts
+
+
+def test_rate_limited_call_is_retried():
+    assert run_flaky() == [0, 1]
+
+
+def test_call_is_not_retried_once_tokens_were_streamed():
+    with pytest.raises(RateLimited):
+        run_flaky(can_retry=lambda: False)
@@ -0,0 +1,34 @@
+from core.risk_engine import liability_multipliers, notice_periods
+
+
+def test_decimal_multiplier_is_not_split():
+    text = "The Supplier's liability is capped at 1.5 times the fees paid."
+
+    assert liability_multipliers(text) == [1.5]
+
+
+def test_decimal_x_multiplier_is_not_split():
+    text = "Total liability shall not exceed 1.5x the contract value."
+
+    assert liability_multipliers(text) == [1.5]
+
+
+def test_notice_period_after_clause_number():
+    text = (
+        "Either party may terminate under Section 12.3 upon ninety (90) days "
+        "written notice. Fees are due monthly."
+    )
+
+    assert notice_periods(text) == [90]
+
+
+def test_liability_multiplier_after_clause_number():
+    text = "Liability under Section 9.1 shall not exceed two (2) times the fees."
+
+    assert liability_multipliers(text) == [2]
+
+
+def test_sentences_are_still_split_on_full_stops():
+    text = "Liability is limited. The fees are 2 times the fees of last year."
+
+    assert liability_multipliers(text) == []
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Legal Contract Analysis Bot - Document cache warm-up
+Parses every knowledge base document into the on-disk document cache so the
+web application starts without re-running PDF/DOCX extraction.
+Run it at Docker build time, after the knowledge base has been copied in.
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add src directory to Python path
+src_path = Path(__file__).parent / "src"
+sys.path.insert(0, str(src_path))
+
+from config.config_manager import ConfigManager
+from document_sources.knowledge_base import load_knowledge_base
+from document_sources.local_file_source import LocalFileSource
+
+
+async def warm_cache() -> int:
+    config = ConfigManager()
+    doc_config = config.get_document_config()
+
+    cache_dir = doc_config.get("cache_dir")
+    if not cache_dir:
+        print("⚠️ document_processing.cache_dir is not set - nothing to warm")
+        return 1
+
+    knowledge_base_path = Path(doc_config.get("knowledge_base_path"))
+    ocr_config = doc_config.get("ocr", {})
+    doc_source = LocalFileSource(
+        cache_dir=cache_dir,
+        max_workers=doc_config.get("ingest_workers"),
+        pdf_pages_per_task=doc_config.get("pdf_pages_per_task", 20),
+        ocr=ocr_config.get("enabled", True),
+        ocr_min_chars=ocr_config.get("min_chars", 20),
+        ocr_resolution=ocr_config.get("resolution", 300),
+        ocr_language=ocr_config.get("language", "eng"),
+    )
+
+    print(f"🔥 Warming document cache in {cache_dir} from {knowledge_base_path}")
+    started = time.perf_counter()
+    documents = await load_knowledge_base(knowledge_base_path, doc_source)
+    elapsed = time.perf_counter() - started
+    print(f"✅ Cached {len(documents)} documents in {elapsed:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(warm_cache()))